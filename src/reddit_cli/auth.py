@@ -7,6 +7,8 @@ from pathlib import Path
 import praw
 from dotenv import load_dotenv
 
+from . import tracing, transport
+
 _H = Path.home()
 
 # Searched in order; first file that provides REDDIT_CLIENT_ID wins.
@@ -36,8 +38,8 @@ Or export them as environment variables before running reddit-cli.
 """
 
 
-def load_credentials() -> tuple[str, str, str]:
-    """Return (client_id, client_secret, user_agent), exiting on error.
+def find_credentials() -> tuple[str, str, str] | None:
+    """Return (client_id, client_secret, user_agent), or None if either key is missing.
 
     Precedence (highest → lowest):
       1. Env vars already exported in the shell
@@ -45,7 +47,13 @@ def load_credentials() -> tuple[str, str, str]:
 
     load_dotenv handles both plain KEY=value and shell `export KEY=value` syntax,
     and silently skips lines it cannot parse (functions, conditionals, etc.).
+
+    Under --replay no request leaves the machine, so placeholders stand in for
+    credentials that may not exist where the recording is replayed.
     """
+    if transport.replaying():
+        return "replay", "replay", "reddit-cli/replay"
+
     if not os.getenv("REDDIT_CLIENT_ID"):
         for path in _CREDENTIAL_FILES:
             if path.exists():
@@ -58,17 +66,33 @@ def load_credentials() -> tuple[str, str, str]:
     user_agent = os.getenv("REDDIT_USER_AGENT", "reddit-cli/1.0").strip()
 
     if not client_id or not client_secret:
+        return None
+    return client_id, client_secret, user_agent
+
+
+def load_credentials() -> tuple[str, str, str]:
+    """find_credentials(), exiting with setup help if none are configured."""
+    credentials = find_credentials()
+    if credentials is None:
         sys.stderr.write(_AUTH_HELP)
         sys.exit(3)
-
-    return client_id, client_secret, user_agent
+    return credentials
 
 
 def get_client() -> praw.Reddit:
-    """Return an authenticated (read-only) PRAW Reddit instance."""
-    client_id, client_secret, user_agent = load_credentials()
-    return praw.Reddit(
-        client_id=client_id,
-        client_secret=client_secret,
-        user_agent=user_agent,
-    )
+    """Return an authenticated (read-only) PRAW Reddit instance.
+
+    All clients in a run share one pooled, keep-alive HTTP session (see transport),
+    so extra clients — e.g. one per worker thread — reuse warm connections.
+    """
+    with tracing.span("load_credentials"):
+        client_id, client_secret, user_agent = load_credentials()
+    with tracing.span("build_client"):
+        return praw.Reddit(
+            client_id=client_id,
+            client_secret=client_secret,
+            user_agent=user_agent,
+            check_for_updates=False,  # skip PRAW's PyPI round-trip on every start
+            requestor_class=tracing.TracingRequestor if tracing.active() else None,
+            requestor_kwargs={"session": transport.session()},
+        )
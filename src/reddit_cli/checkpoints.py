@@ -0,0 +1,32 @@
+"""Persistent per-user cursors for incremental `user --since-checkpoint` syncs."""
+
+import json
+import os
+from pathlib import Path
+
+_PATH = Path.home() / ".config" / "reddit-cli" / "user-checkpoints.json"
+
+# Statuses recorded for users whose history can't be read; skipped on later runs.
+UNREADABLE = ("private", "not_found")
+
+
+def key(username: str, what: str) -> str:
+    return f"{username.lower()}:{what}"
+
+
+def load(path: Path = _PATH) -> dict[str, dict]:
+    """Return {"<user>:<what>": {"newest", "newest_utc", "status", "checked"}}; empty if absent."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save(data: dict[str, dict], path: Path = _PATH) -> None:
+    """Write checkpoints atomically so an interrupted run never leaves a torn file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
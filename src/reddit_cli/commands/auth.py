@@ -1,11 +1,136 @@
 """reddit-cli auth — verify credentials are working."""
 
+import hashlib
+import json
+import os
 import sys
+import time
+from pathlib import Path
 
-from ..auth import get_client, _CREDENTIAL_FILES
+from prawcore import ReadOnlyAuthorizer, Requestor, TrustedAuthenticator
 
+from .. import tracing, transport
+from ..auth import find_credentials, get_client, _CREDENTIAL_FILES
+
+# Probe results only: a credential fingerprint and token expiry, never the token itself.
+_PROBE_CACHE = Path.home() / ".config" / "reddit-cli" / "auth-probe.json"
+
+
+def _fingerprint(client_id: str, client_secret: str) -> str:
+    return hashlib.sha256(f"{client_id}:{client_secret}".encode()).hexdigest()[:16]
+
+
+def _read_cache(fingerprint: str, ttl: float) -> dict | None:
+    try:
+        with open(_PROBE_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    now = time.time()
+    if cached.get("fingerprint") != fingerprint or now - cached.get("checked", 0) > ttl:
+        return None
+    if cached.get("expires_at", 0) <= now:
+        return None
+    return cached
+
+
+def _write_cache(fingerprint: str, expires_at: float) -> None:
+    try:
+        _PROBE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _PROBE_CACHE.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "checked": time.time(), "expires_at": expires_at}, f)
+        os.replace(tmp, _PROBE_CACHE)
+    except OSError:
+        pass  # a read-only home shouldn't fail the health check
+
+
+class _TokenRequestor:
+    """Wraps a prawcore Requestor to keep expires_in from the token response.
+
+    prawcore turns it into a private deadline on the authorizer, so the probe
+    reads the payload itself rather than depend on that attribute.
+    """
+
+    def __init__(self, requestor) -> None:
+        self._requestor = requestor
+        self.expires_in = None
+
+    def __getattr__(self, name):
+        return getattr(self._requestor, name)
+
+    def request(self, *args, **kwargs):
+        response = self._requestor.request(*args, **kwargs)
+        if response.status_code == 200:
+            try:
+                self.expires_in = response.json().get("expires_in")
+            except ValueError:
+                pass  # prawcore reports the bad payload itself
+        return response
+
+
+def _fail(start: float, error: str) -> int:
+    print(json.dumps({
+        "ok": False,
+        "cached": False,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+        "error": error,
+    }))
+    return 3
+
+
+def _probe(args) -> int:
+    """Token-only health check: one token request (or none, if recently cached), JSON out."""
+    credentials = find_credentials()
+    if credentials is None:
+        # No request was made, so there is no latency to report
+        return _fail(time.perf_counter(), "missing REDDIT_CLIENT_ID or REDDIT_CLIENT_SECRET")
+    client_id, client_secret, user_agent = credentials
+    fingerprint = _fingerprint(client_id, client_secret)
+    start = time.perf_counter()
+
+    use_cache = args.cache_ttl > 0 and not transport.replaying()
+    cached = _read_cache(fingerprint, args.cache_ttl) if use_cache else None
+    if cached:
+        result = {
+            "ok": True,
+            "cached": True,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            "expires_in": int(cached["expires_at"] - time.time()),
+        }
+        print(json.dumps(result))
+        return 0
+
+    requestor_class = tracing.TracingRequestor if tracing.active() else Requestor
+    requestor = _TokenRequestor(
+        requestor_class(user_agent=user_agent, session=transport.session(), timeout=args.timeout)
+    )
+    authenticator = TrustedAuthenticator(requestor=requestor, client_id=client_id, client_secret=client_secret)
+    authorizer = ReadOnlyAuthorizer(authenticator=authenticator)
+    try:
+        authorizer.refresh()
+    except Exception as e:
+        return _fail(start, str(e))
+
+    latency = time.perf_counter() - start
+    expires_in = requestor.expires_in
+    if expires_in is None:
+        return _fail(start, "token response has no expires_in")
+    if use_cache:
+        _write_cache(fingerprint, time.time() + expires_in)
+    print(json.dumps({
+        "ok": True,
+        "cached": False,
+        "latency_ms": round(latency * 1000, 3),
+        "expires_in": int(expires_in),
+    }))
+    return 0
+
+
+def run(args) -> int:
+    if args.probe:
+        return _probe(args)
 
-def run(_args) -> int:
     reddit = get_client()
 
     try:
@@ -5,6 +5,7 @@ import sys
 
 from praw.models import MoreComments
 
+from .. import tracing
 from ..auth import get_client
 from ..output import (
     comment_to_dict,
@@ -36,13 +37,17 @@ def _recurse(comment_forest, depth_remaining: int, current_depth: int, min_score
 
 def _collect_comments(submission, limit: int, min_score: int, depth: int) -> list[dict]:
     """Collect comments with optional nested reply traversal."""
+    with tracing.span("fetch", id=submission.id):
+        forest = submission.comments  # lazy: loads the submission and its comment tree
     try:
-        submission.comments.replace_more(limit=0)
+        with tracing.span("replace_more"):
+            forest.replace_more(limit=0)
     except Exception:
         pass
 
     items: list[dict] = []
-    _recurse(submission.comments, depth, 0, min_score, items)
+    with tracing.span("convert"):
+        _recurse(forest, depth, 0, min_score, items)
 
     # For top-level-only (depth=0), sort by score and cap at limit.
     # For nested traversal, preserve tree order but still cap total count.
@@ -73,9 +78,10 @@ def run(args) -> int:
         sys.stderr.write(f"[comments] {len(items)} comments\n")
         sys.stderr.flush()
 
-    if args.output == "json":
-        print_comments_json(items)
-    else:
-        print_comments_compact(items)
+    with tracing.span("render", items=len(items)):
+        if args.output == "json":
+            print_comments_json(items)
+        else:
+            print_comments_compact(items)
 
     return 0
@@ -2,55 +2,50 @@
 
 import sys
 
+from .. import listing, tracing
 from ..auth import get_client
-from ..output import (
-    post_to_dict,
-    print_posts_compact,
-    print_posts_csv,
-    print_posts_json,
-)
+from ..dedup import Deduper
+from ..output import open_sink, post_record, raw_post
 
 
 def run(args) -> int:
     reddit = get_client()
     limit = min(args.limit, 100)
+    deduper = Deduper(near_threshold=args.near_dup) if args.dedup or args.near_dup else None
 
     if not args.quiet:
-        time_note = f" time={args.time}" if args.sort in ("top", "controversial") else ""
+        time_note = f" time={args.time}" if args.sort in listing.TIMED_SORTS else ""
         sys.stderr.write(
-            f"[domain] {args.domain} sort={args.sort}{time_note} limit={limit}\n"
+            f"[domain] {' '.join(args.domain)} sort={args.sort}{time_note} limit={limit}\n"
         )
         sys.stderr.flush()
 
+    sources = [
+        listing.fetch(reddit.domain(name), args.sort, time_filter=args.time, limit=limit)
+        for name in args.domain
+    ]
     try:
-        domain_obj = reddit.domain(args.domain)
-        if args.sort == "hot":
-            gen = domain_obj.hot(limit=limit)
-        elif args.sort == "new":
-            gen = domain_obj.new(limit=limit)
-        elif args.sort == "rising":
-            gen = domain_obj.rising(limit=limit)
-        elif args.sort == "top":
-            gen = domain_obj.top(time_filter=args.time, limit=limit)
-        else:  # controversial
-            gen = domain_obj.controversial(time_filter=args.time, limit=limit)
-
-        results = list(gen)
+        with tracing.span("stream"):
+            count, first = listing.run(
+                sources,
+                extract=raw_post,
+                finish=post_record,
+                sink=open_sink(args.output),
+                stages=[deduper.filter] if deduper else [],
+                workers=args.workers,
+            )
     except Exception as e:
         sys.stderr.write(f"Error: Domain fetch failed — {e}\n")
         return 1
 
     if not args.quiet:
-        sys.stderr.write(f"[domain] {len(results)} posts\n")
+        notes = []
+        if first is not None:
+            notes.append(f"first after {first:.2f}s")
+        if deduper:
+            notes.append(f"{deduper.dropped} duplicates dropped")
+        note = f" ({', '.join(notes)})" if notes else ""
+        sys.stderr.write(f"[domain] {count} posts{note}\n")
         sys.stderr.flush()
 
-    items = [post_to_dict(p) for p in results]
-
-    if args.output == "json":
-        print_posts_json(items)
-    elif args.output == "csv":
-        print_posts_csv(items)
-    else:
-        print_posts_compact(items)
-
     return 0
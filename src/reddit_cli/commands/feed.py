@@ -2,55 +2,60 @@
 
 import sys
 
+from .. import listing, tracing
 from ..auth import get_client
-from ..output import (
-    post_to_dict,
-    print_posts_compact,
-    print_posts_csv,
-    print_posts_json,
-)
+from ..matching import Matcher
+from ..output import open_sink, post_record, raw_post
 
 
 def run(args) -> int:
+    matcher = None
+    if args.match_file:
+        try:
+            matcher = Matcher.from_file(args.match_file)
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"Error: --match-file: {e}\n")
+            return 2
+
     reddit = get_client()
     limit = min(args.limit, 100)
 
     if not args.quiet:
-        time_note = f" time={args.time}" if args.sort in ("top", "controversial") else ""
+        time_note = f" time={args.time}" if args.sort in listing.TIMED_SORTS else ""
         sys.stderr.write(
             f"[feed] r/{args.subreddit} sort={args.sort}{time_note} limit={limit}\n"
         )
         sys.stderr.flush()
 
+    def extract(post) -> dict:
+        raw = raw_post(post)
+        if matcher:
+            raw["matched"] = matcher.take(post)
+        return raw
+
+    source = listing.fetch(reddit.subreddit(args.subreddit), args.sort, time_filter=args.time, limit=limit)
     try:
-        sub = reddit.subreddit(args.subreddit)
-        if args.sort == "hot":
-            gen = sub.hot(limit=limit)
-        elif args.sort == "new":
-            gen = sub.new(limit=limit)
-        elif args.sort == "rising":
-            gen = sub.rising(limit=limit)
-        elif args.sort == "top":
-            gen = sub.top(time_filter=args.time, limit=limit)
-        else:  # controversial
-            gen = sub.controversial(time_filter=args.time, limit=limit)
-
-        results = list(gen)
+        with tracing.span("stream"):
+            count, first = listing.run(
+                [source],
+                extract=extract,
+                finish=post_record,
+                sink=open_sink(args.output, matched=bool(matcher)),
+                stages=[matcher.filter] if matcher else [],
+                workers=args.workers,
+            )
     except Exception as e:
         sys.stderr.write(f"Error: Feed fetch failed — {e}\n")
         return 1
 
     if not args.quiet:
-        sys.stderr.write(f"[feed] {len(results)} posts\n")
+        notes = []
+        if first is not None:
+            notes.append(f"first after {first:.2f}s")
+        if matcher:
+            notes.append(f"{matcher.dropped} not matching dropped")
+        note = f" ({', '.join(notes)})" if notes else ""
+        sys.stderr.write(f"[feed] {count} posts{note}\n")
         sys.stderr.flush()
 
-    items = [post_to_dict(p) for p in results]
-
-    if args.output == "json":
-        print_posts_json(items)
-    elif args.output == "csv":
-        print_posts_csv(items)
-    else:
-        print_posts_compact(items)
-
     return 0
@@ -4,8 +4,9 @@ import json
 import re
 import sys
 
+from .. import tracing
 from ..auth import get_client
-from ..output import format_ts, _bold, _cyan, _dim
+from ..output import Renderer, format_ts
 
 
 def _extract_id(id_or_url: str) -> str:
@@ -29,7 +30,8 @@ def run(args) -> int:
     try:
         post = reddit.submission(sub_id)
         # Force attribute fetch
-        _ = post.title
+        with tracing.span("fetch", id=sub_id):
+            _ = post.title
     except Exception as e:
         sys.stderr.write(f"Error: Could not fetch post {sub_id!r} — {e}\n")
         return 1
@@ -50,12 +52,13 @@ def run(args) -> int:
     if args.output == "json":
         print(json.dumps(d, indent=2))
     else:
-        print(f"{_bold(d['title'])}")
-        print(f"{_cyan('r/' + d['subreddit'])} · u/{d['author'] or '[deleted]'} · {d['date']}")
-        print(f"Score: {d['score']} ({int(d['upvote_ratio']*100)}% upvoted) · {d['num_comments']} comments")
-        print(_dim(d["url"]))
-        if d["selftext"]:
-            print()
-            print(d["selftext"])
+        with Renderer() as r:
+            r.line(f"{r.bold(d['title'])}")
+            r.line(f"{r.cyan('r/' + d['subreddit'])} · u/{d['author'] or '[deleted]'} · {d['date']}")
+            r.line(f"Score: {d['score']} ({int(d['upvote_ratio']*100)}% upvoted) · {d['num_comments']} comments")
+            r.line(r.dim(d["url"]))
+            if d["selftext"]:
+                r.line()
+                r.line(d["selftext"])
 
     return 0
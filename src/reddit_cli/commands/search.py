@@ -3,14 +3,11 @@
 import sys
 from praw.models import MoreComments
 
+from .. import listing, tracing
 from ..auth import get_client
-from ..output import (
-    comment_to_dict,
-    post_to_dict,
-    print_posts_compact,
-    print_posts_csv,
-    print_posts_json,
-)
+from ..dedup import Deduper
+from ..matching import Matcher
+from ..output import comment_record, open_sink, post_record, raw_comment, raw_post
 
 # Canonical day counts for each PRAW time_filter bucket
 _BUCKET_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
@@ -38,31 +35,116 @@ def _snap_note(days: int, resolved: str) -> str | None:
 
 
 def _fetch_top_comments(submission, limit: int = 5) -> list[dict]:
-    """Fetch top-level comments sorted by score."""
+    """Fetch top-level comments sorted by score, as raw_comment() dicts."""
     try:
-        submission.comments.replace_more(limit=0)
+        with tracing.span("replace_more", id=submission.id):
+            submission.comments.replace_more(limit=0)
     except Exception:
         return []
     comments = []
     for comment in submission.comments:
         if isinstance(comment, MoreComments):
             continue
-        d = comment_to_dict(comment)
-        if d:
-            comments.append(d)
+        raw = raw_comment(comment)
+        if raw:
+            comments.append(raw)
         if len(comments) >= limit:
             break
     return sorted(comments, key=lambda c: c["score"], reverse=True)
 
 
+def _release_comments(submission) -> None:
+    """Drop the fetched comment forest so it can be freed once the post is converted.
+
+    The listing generator keeps its current page of submissions alive, and each
+    enriched submission would otherwise pin its whole comment tree until the page
+    is exhausted.
+    """
+    submission.__dict__.pop("_comments", None)
+    submission._comments_by_id = {}
+
+
+def _finish(raw: dict) -> dict:
+    """post_record() for a search result, rendering the comments of an enriched one."""
+    if "comments" not in raw:
+        return post_record(raw)
+    return post_record(raw, comments=[comment_record(c) for c in raw["comments"]])
+
+
+class _EnrichBudget:
+    """Caps enrichment text: each body at max_chars, all bodies together at max_bytes (UTF-8)."""
+
+    _MARK = "…"  # appended to anything cut short
+
+    def __init__(self, max_chars: int | None = None, max_bytes: int | None = None) -> None:
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.truncated = 0
+        self.enriched = 0
+        self.skipped = 0
+
+    def exhausted(self) -> bool:
+        return self.max_bytes is not None and self.used >= self.max_bytes
+
+    def take(self, text: str) -> str | None:
+        """Return text cut to the limits and charge it, or None once no budget is left."""
+        cut = False
+        if self.max_chars is not None and len(text) > self.max_chars:
+            text = text[:self.max_chars] + self._MARK
+            cut = True
+        size = len(text.encode())
+        if self.max_bytes is not None and size > self.max_bytes - self.used:
+            room = self.max_bytes - self.used - len(self._MARK.encode())
+            if room <= 0:
+                self.used = self.max_bytes
+                return None
+            text = text.encode()[:room].decode("utf-8", "ignore") + self._MARK
+            size = len(text.encode())
+            cut = True
+        self.truncated += cut
+        self.used += size
+        return text
+
+    def summary(self) -> str:
+        parts = []
+        if self.max_bytes is not None:
+            parts.append(f"{self.used:,} of {self.max_bytes:,} bytes used")
+        else:
+            parts.append(f"{self.used:,} bytes")
+        parts.append(f"{self.enriched} posts enriched")
+        if self.skipped:
+            parts.append(f"{self.skipped} over budget")
+        if self.truncated:
+            parts.append(f"{self.truncated} bodies truncated")
+        return " · ".join(parts)
+
+
 def run(args) -> int:
+    budgeted = args.max_body_chars is not None or args.max_enrich_bytes is not None
+    if budgeted and not args.enrich:
+        sys.stderr.write("Error: --max-body-chars and --max-enrich-bytes need --enrich\n")
+        return 2
+
+    matcher = None
+    if args.match_file:
+        try:
+            matcher = Matcher.from_file(args.match_file)
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"Error: --match-file: {e}\n")
+            return 2
+
     reddit = get_client()
     time_filter = _resolve_time_filter(args.days)
     limit = min(args.limit, 100)
 
+    queries = args.query
+    deduper = Deduper(near_threshold=args.near_dup) if args.dedup or args.near_dup else None
+
     if not args.quiet:
+        q = queries[0] if len(queries) == 1 else queries
         sys.stderr.write(
-            f"[search] q={args.query!r} sub=r/{args.subreddit} "
+            f"[search] q={q!r} sub=r/{args.subreddit} "
             f"sort={args.sort} days={args.days}({time_filter}) limit={limit}\n"
         )
         note = _snap_note(args.days, time_filter)
@@ -70,33 +152,77 @@ def run(args) -> int:
             sys.stderr.write(note)
         sys.stderr.flush()
 
+    subreddit = reddit.subreddit(args.subreddit)
+    sources = [
+        subreddit.search(query, sort=args.sort, time_filter=time_filter, limit=limit)
+        for query in queries
+    ]
+    enrich_limit = getattr(args, "enrich_comments", 5)
+    budget = _EnrichBudget(args.max_body_chars, args.max_enrich_bytes)
+
+    def extract(post) -> dict:
+        if not args.enrich or budget.exhausted():
+            raw = raw_post(post)
+            if args.enrich:
+                # Budget spent: the rest go out unenriched, without a comment fetch,
+                # but with the same keys so consumers needn't special-case them
+                budget.skipped += 1
+                raw["selftext"] = ""
+                raw["comments"] = []
+            if matcher:
+                raw["matched"] = matcher.take(post)
+            return raw
+        comments = _fetch_top_comments(post, enrich_limit)
+        raw = raw_post(post)
+        raw["selftext"] = budget.take(post.selftext or "") or ""
+        kept = []
+        for c in comments:
+            body = budget.take(c["body"])
+            if body is None:
+                break
+            kept.append({**c, "body": body})
+        budget.enriched += 1
+        raw["comments"] = kept
+        if matcher:
+            raw["matched"] = matcher.take(post, comments)
+        _release_comments(post)
+        return raw
+
+    stages = []
+    if deduper:
+        # Dedup first: duplicates never cost a match scan or a comment fetch
+        stages.append(deduper.filter)
+    if matcher:
+        # Title/selftext only: filtering runs before enrichment so dropped posts
+        # never cost a comment fetch; fetched comments then add their own hits
+        stages.append(matcher.filter)
+
     try:
-        subreddit = reddit.subreddit(args.subreddit)
-        results = list(subreddit.search(
-            args.query,
-            sort=args.sort,
-            time_filter=time_filter,
-            limit=limit,
-        ))
+        with tracing.span("stream", enrich=args.enrich):
+            count, first = listing.run(
+                sources,
+                extract=extract,
+                finish=_finish,
+                sink=open_sink(args.output, matched=bool(matcher)),
+                stages=stages,
+                workers=args.workers,
+            )
     except Exception as e:
         sys.stderr.write(f"Error: Reddit search failed — {e}\n")
         return 1
 
     if not args.quiet:
-        sys.stderr.write(f"[search] {len(results)} results\n")
+        notes = []
+        if first is not None:
+            notes.append(f"first after {first:.2f}s")
+        if matcher:
+            notes.append(f"{matcher.dropped} not matching dropped")
+        if deduper:
+            notes.append(f"{deduper.dropped} duplicates dropped")
+        note = f" ({', '.join(notes)})" if notes else ""
+        sys.stderr.write(f"[search] {count} results{note}\n")
+        if budgeted:
+            sys.stderr.write(f"[search] enrichment: {budget.summary()}\n")
         sys.stderr.flush()
 
-    enrich_limit = getattr(args, "enrich_comments", 5)
-    items = []
-    for post in results:
-        comments = _fetch_top_comments(post, enrich_limit) if args.enrich else None
-        items.append(post_to_dict(post, include_selftext=args.enrich, comments=comments))
-
-    if args.output == "json":
-        print_posts_json(items)
-    elif args.output == "csv":
-        print_posts_csv(items)
-    else:
-        print_posts_compact(items)
-
     return 0
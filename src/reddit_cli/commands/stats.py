@@ -0,0 +1,245 @@
+"""reddit-cli stats — aggregate score/engagement metrics over pulled data."""
+
+import csv
+import gzip
+import json
+import math
+import sys
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from datetime import date
+from itertools import chain
+from operator import itemgetter, methodcaller
+
+from ..output import print_stats_compact, print_stats_json
+
+# Columns read from post_record / comment_record output. Everything else is ignored.
+# Numeric columns map to the type CSV cells are parsed as, matching JSON input.
+_NUMERIC = {"score": int, "num_comments": int, "upvote_ratio": float}
+_TEXT = ("subreddit", "author", "date")
+_COLUMNS = tuple(_NUMERIC) + _TEXT
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_PERCENTILES = (50, 90, 99)
+
+
+def _open(path: str):
+    """Open FILE (or stdin for '-') as text, transparently decompressing .gz archives."""
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def _empty_columns() -> dict[str, list]:
+    return {name: [] for name in _COLUMNS}
+
+
+# Bytes of NDJSON read, decoded and appended per batch
+_BATCH_BYTES = 4 << 20
+
+
+def _append_rows(cols: dict[str, list], rows: list) -> None:
+    """Append decoded JSON records column-by-column."""
+    for name in _COLUMNS:
+        cols[name].extend(map(methodcaller("get", name), rows))
+
+
+def _append_lines(cols: dict[str, list], lines: list[str]) -> None:
+    """Decode a batch of NDJSON lines with one json.loads call, then append it."""
+    lines = list(filter(str.strip, lines))
+    if lines:
+        _append_rows(cols, json.loads("[" + ",".join(lines) + "]"))
+
+
+def _read_csv(first_line: str, stream) -> dict[str, list]:
+    reader = csv.reader(chain((first_line,), stream))
+    header = next(reader)
+    index = {name: header.index(name) for name in _COLUMNS if name in header}
+    rows = list(reader)
+    cols = {name: [None] * len(rows) for name in _COLUMNS}
+    for name, i in index.items():
+        cols[name] = list(map(itemgetter(i), rows))
+    # CSV carries no types; coerce numeric columns in one pass each.
+    for name, kind in _NUMERIC.items():
+        if name in index:
+            cols[name] = [kind(v) if v else None for v in cols[name]]
+    for name in ("author", "subreddit"):
+        cols[name] = [v or None for v in cols[name]]
+    return cols
+
+
+def _envelope_rows(doc) -> list | None:
+    """The record list of an {"items": [...]} / {"comments": [...]} document, else None."""
+    if not isinstance(doc, dict) or "id" in doc or "title" in doc:
+        return None
+    for key in ("items", "comments"):
+        if isinstance(doc.get(key), list):
+            return doc[key]
+    return None
+
+
+def _check_dates(dates: list) -> None:
+    """Raise ValueError for a date cell that isn't YYYY-MM-DD (checked once per distinct value)."""
+    for d in set(dates):
+        if d:
+            try:
+                date.fromisoformat(d)
+            except (TypeError, ValueError):
+                raise ValueError(f"invalid date {d!r}") from None
+
+
+def load_columns(stream) -> dict[str, list]:
+    """Read a JSON document, NDJSON, or CSV stream into per-field column lists.
+
+    Format is sniffed from the first non-blank line: a complete JSON value is
+    either a compact {"items": [...]} document (e.g. from `jq -c`) or, otherwise,
+    the first NDJSON record (enriched records carry their own comments list, so
+    that alone says nothing about the format); an incomplete one means a
+    pretty-printed document, anything else is a CSV header. Raises ValueError for
+    malformed input, including dates the weekday histogram couldn't parse.
+    """
+    cols = _load(stream)
+    _check_dates(cols["date"])
+    return cols
+
+
+def _load(stream) -> dict[str, list]:
+    first = ""
+    for line in stream:
+        if line.strip():
+            first = line
+            break
+    if not first:
+        return _empty_columns()
+
+    if not first.lstrip().startswith("{"):
+        return _read_csv(first, stream)
+
+    cols = _empty_columns()
+    try:
+        doc = json.loads(first)
+    except json.JSONDecodeError:
+        rows = _envelope_rows(json.loads(first + stream.read()))
+        if rows is None:
+            raise ValueError("JSON document has no top-level items or comments list") from None
+        _append_rows(cols, rows)
+        return cols
+
+    rows = _envelope_rows(doc)
+    if rows is not None:
+        # One compact document per line
+        _append_rows(cols, rows)
+        for line in filter(str.strip, stream):
+            rows = _envelope_rows(json.loads(line))
+            if rows is None:
+                raise ValueError("expected one {\"items\": [...]} document per line")
+            _append_rows(cols, rows)
+        return cols
+
+    # NDJSON: one decode per batch of lines, columns grown with list.extend
+    _append_rows(cols, [doc])
+    while batch := stream.readlines(_BATCH_BYTES):
+        _append_lines(cols, batch)
+    return cols
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already-sorted column (numpy's default)."""
+    pos = (len(sorted_values) - 1) * pct / 100
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _numeric(values) -> list[float]:
+    return [v for v in values if v is not None]
+
+
+def _weekday_histogram(dates) -> dict[str, int]:
+    # Few distinct dates even in huge pulls: count first, parse each date once.
+    counts: Counter = Counter()
+    for d, n in Counter(dates).items():
+        if d:
+            counts[_WEEKDAYS[date.fromisoformat(d).weekday()]] += n
+    return {day: counts.get(day, 0) for day in _WEEKDAYS}
+
+
+def summarise(cols: dict[str, list], top: int) -> dict:
+    """Compute aggregate metrics for one group of columns."""
+    scores = sorted(_numeric(cols["score"]))
+    out: dict = {"count": len(cols["score"])}
+
+    if scores:
+        out["score"] = {
+            **{f"p{p}": round(_percentile(scores, p), 2) for p in _PERCENTILES},
+            "max": scores[-1],
+            "mean": round(math.fsum(scores) / len(scores), 2),
+        }
+
+    num_comments = _numeric(cols["num_comments"])
+    if num_comments:
+        upvotes = math.fsum(scores[bisect_right(scores, 0):])  # scores is sorted
+        out["comments_per_upvote"] = round(math.fsum(num_comments) / upvotes, 4) if upvotes else None
+
+    ratios = _numeric(cols["upvote_ratio"])
+    if ratios:
+        out["upvote_ratio_mean"] = round(math.fsum(ratios) / len(ratios), 4)
+
+    out["weekday"] = _weekday_histogram(cols["date"])
+    authors = Counter(cols["author"])
+    authors.pop(None, None)
+    out["top_authors"] = [{"author": a, "count": n} for a, n in authors.most_common(top)]
+    return out
+
+
+def _group_by_subreddit(cols: dict[str, list]) -> dict[str, dict[str, list]]:
+    positions: dict[str, list[int]] = defaultdict(list)
+    for i, name in enumerate(cols["subreddit"]):
+        positions[name or "?"].append(i)
+
+    groups = {}
+    for name, idx in positions.items():
+        pick = itemgetter(*idx)
+        # itemgetter returns a bare value (not a tuple) for a single index
+        groups[name] = {
+            col: (list(pick(values)) if len(idx) > 1 else [pick(values)])
+            for col, values in cols.items()
+        }
+    return groups
+
+
+def run(args) -> int:
+    if not args.quiet:
+        src = "stdin" if args.file == "-" else args.file
+        sys.stderr.write(f"[stats] src={src} by_subreddit={args.by_subreddit}\n")
+        sys.stderr.flush()
+
+    try:
+        stream = _open(args.file)
+        try:
+            cols = load_columns(stream)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    except (OSError, ValueError, csv.Error) as e:
+        sys.stderr.write(f"Error: Could not read {args.file!r} — {e}\n")
+        return 1
+
+    stats = {"overall": summarise(cols, args.top)}
+    if args.by_subreddit:
+        groups = _group_by_subreddit(cols)
+        ordered = sorted(groups.items(), key=lambda kv: len(kv[1]["score"]), reverse=True)
+        stats["subreddits"] = {name: summarise(g, args.top) for name, g in ordered}
+
+    if not args.quiet:
+        sys.stderr.write(f"[stats] {stats['overall']['count']} rows\n")
+        sys.stderr.flush()
+
+    if args.output == "json":
+        print_stats_json(stats)
+    else:
+        print_stats_compact(stats)
+
+    return 0
@@ -2,48 +2,110 @@
 
 import sys
 
+from .. import tracing
 from ..auth import get_client
 from ..output import (
     subreddit_to_dict,
     print_subreddits_compact,
     print_subreddits_json,
 )
+from ..subindex import SubredditIndex, record_from_subreddit
 
 
-def run(args) -> int:
+def _sync_index(args) -> int:
     reddit = get_client()
 
     if not args.quiet:
-        if args.popular or not args.query:
-            sys.stderr.write(f"[subreddits] popular limit={args.limit}\n")
-        else:
-            sys.stderr.write(f"[subreddits] q={args.query!r} by={args.by} limit={args.limit}\n")
+        sys.stderr.write(f"[subreddits] syncing index limit={args.index_limit} per listing\n")
         sys.stderr.flush()
 
     try:
+        try:
+            index = SubredditIndex.load()
+        except (FileNotFoundError, ValueError):
+            index = SubredditIndex()
+        before = len(index)
+        records = []
+        for listing in (reddit.subreddits.popular, reddit.subreddits.new):
+            with tracing.span("fetch", listing=listing.__name__):
+                records.extend(record_from_subreddit(s) for s in listing(limit=args.index_limit))
+        index = index.merge(records)
+        index.save()
+    except Exception as e:
+        sys.stderr.write(f"Error: Subreddit index sync failed — {e}\n")
+        return 1
+
+    if not args.quiet:
+        sys.stderr.write(
+            f"[subreddits] index has {len(index)} subreddits ({len(index) - before} new)\n"
+        )
+        sys.stderr.flush()
+    return 0
+
+
+def _query_local(args) -> list[dict] | None:
+    try:
+        index = SubredditIndex.load()
+    except FileNotFoundError:
+        sys.stderr.write("Error: No local subreddit index — run `reddit-cli subreddits --sync-index` first.\n")
+        return None
+    except ValueError as e:
+        sys.stderr.write(f"Error: Could not load subreddit index — {e}\n")
+        return None
+
+    if args.popular or not args.query:
+        hits = index.popular(args.limit)
+    elif args.by == "name":
+        hits = index.prefix(args.query, args.limit)
+    else:
+        hits = index.search(args.query, args.limit)
+    return [index.to_dict(i) for i in hits]
+
+
+def run(args) -> int:
+    if args.sync_index:
+        return _sync_index(args)
+
+    if not args.quiet:
+        where = " (local)" if args.local else ""
         if args.popular or not args.query:
-            source = reddit.subreddits.popular(limit=args.limit)
-        elif args.by == "name":
-            source = reddit.subreddits.search_by_name(args.query, include_nsfw=False)
+            sys.stderr.write(f"[subreddits] popular limit={args.limit}{where}\n")
         else:
-            source = reddit.subreddits.search(args.query)
+            sys.stderr.write(f"[subreddits] q={args.query!r} by={args.by} limit={args.limit}{where}\n")
+        sys.stderr.flush()
 
-        items = []
-        for sub in source:
-            items.append(subreddit_to_dict(sub))
-            if len(items) >= args.limit:
-                break
-    except Exception as e:
-        sys.stderr.write(f"Error: Subreddit search failed — {e}\n")
-        return 1
+    if args.local:
+        items = _query_local(args)
+        if items is None:
+            return 1
+    else:
+        reddit = get_client()
+        try:
+            if args.popular or not args.query:
+                source = reddit.subreddits.popular(limit=args.limit)
+            elif args.by == "name":
+                source = reddit.subreddits.search_by_name(args.query, include_nsfw=False)
+            else:
+                source = reddit.subreddits.search(args.query)
+
+            items = []
+            with tracing.span("fetch"):
+                for sub in source:
+                    items.append(subreddit_to_dict(sub))
+                    if len(items) >= args.limit:
+                        break
+        except Exception as e:
+            sys.stderr.write(f"Error: Subreddit search failed — {e}\n")
+            return 1
 
     if not args.quiet:
         sys.stderr.write(f"[subreddits] {len(items)} results\n")
         sys.stderr.flush()
 
-    if args.output == "json":
-        print_subreddits_json(items)
-    else:
-        print_subreddits_compact(items)
+    with tracing.span("render", items=len(items)):
+        if args.output == "json":
+            print_subreddits_json(items)
+        else:
+            print_subreddits_compact(items)
 
     return 0
@@ -0,0 +1,105 @@
+"""reddit-cli track — snapshot post engagement on an interval into a delta log."""
+
+import heapq
+import sys
+import time
+from operator import itemgetter
+
+from .. import tracing, tracklog
+from ..auth import get_client
+from ..output import emit, print_rising_compact, print_rising_json
+from .post import _extract_id
+
+
+def _read_ids(path: str) -> list[str]:
+    """Post IDs or URLs, one per line ('#' comments allowed); duplicates dropped, order kept."""
+    ids = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                ids[_extract_id(line).lower()] = None
+    return list(ids)
+
+
+def _refresh(reddit, ids: list[str]) -> list[tuple]:
+    """(id, score, num_comments, upvote_ratio) for every post still visible.
+
+    reddit.info batches fullnames 100 per /api/info request, so a refresh costs
+    len(ids) / 100 requests rather than one per post.
+    """
+    return [
+        (post.id, post.score, post.num_comments, post.upvote_ratio)
+        for post in reddit.info(fullnames=[f"t3_{i}" for i in ids])
+    ]
+
+
+def _rising(args) -> int:
+    try:
+        rows, last_ts = tracklog.velocities(args.log, window=args.window)
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    if last_ts is None:
+        sys.stderr.write(f"Error: no snapshots in {args.log} — run `reddit-cli track IDS_FILE` first\n")
+        return 1
+
+    top = heapq.nlargest(args.rising, rows, key=itemgetter("score_per_hour"))
+    if not args.quiet:
+        sys.stderr.write(
+            f"[track] fastest rising over {args.window / 3600:g}h · {len(rows):,} posts · "
+            f"last snapshot {time.strftime('%Y-%m-%d %H:%M', time.localtime(last_ts))}\n"
+        )
+        sys.stderr.flush()
+    emit(top, args.output, compact_fn=print_rising_compact, json_fn=print_rising_json)
+    return 0
+
+
+def run(args) -> int:
+    if args.rising is not None:
+        return _rising(args)
+
+    if not args.ids_file:
+        sys.stderr.write("Error: provide an IDS_FILE to track, or --rising N to query the log\n")
+        return 2
+    try:
+        ids = _read_ids(args.ids_file)
+        log = tracklog.TrackLog(args.log)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    if not ids:
+        sys.stderr.write(f"Error: no post IDs in {args.ids_file}\n")
+        return 2
+
+    reddit = get_client()
+    if not args.quiet:
+        every = "once" if args.once else f"every {args.interval:g}s"
+        sys.stderr.write(f"[track] {len(ids):,} posts {every} → {args.log}\n")
+        sys.stderr.flush()
+
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                with tracing.span("refresh", posts=len(ids)):
+                    observed = _refresh(reddit, ids)
+            except Exception as e:
+                sys.stderr.write(f"Error: refresh failed — {e}\n")
+                if args.once:
+                    return 1
+            else:
+                written = log.append(time.time(), observed)
+                if not args.quiet:
+                    missing = len(ids) - len(observed)
+                    missing_note = f", {missing:,} unavailable" if missing else ""
+                    sys.stderr.write(
+                        f"[track] cycle {log.cycles}: {len(observed):,} refreshed, "
+                        f"{written:,} changed{missing_note} ({time.monotonic() - started:.1f}s)\n"
+                    )
+                    sys.stderr.flush()
+            if args.once:
+                return 0
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        return 0
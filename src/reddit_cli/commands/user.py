@@ -1,78 +1,178 @@
 """reddit-cli user — fetch a redditor's recent posts or comments."""
 
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import prawcore.exceptions
 
-from ..auth import get_client
-from ..output import (
-    comment_to_dict,
-    post_to_dict,
-    print_comments_compact,
-    print_comments_json,
-    print_posts_compact,
-    print_posts_csv,
-    print_posts_json,
-)
+from .. import checkpoints, listing, tracing
+from ..auth import get_client, load_credentials
+from ..output import comment_record, open_sink, post_record, raw_comment, raw_post
+
+class _NothingReadable(Exception):
+    """Every requested user failed; raised through the sink so it writes no document."""
+
+
+# PRAW instances aren't thread-safe, so each worker thread gets its own client.
+_local = threading.local()
+
+
+def _client():
+    if not hasattr(_local, "reddit"):
+        _local.reddit = get_client()
+    return _local.reddit
+
+
+def _clean_username(name: str) -> str:
+    return re.sub(r"^/?u/", "", name.strip())
+
+
+def _read_usernames(args) -> list[str]:
+    names = list(args.username)
+    if args.users_file:
+        with open(args.users_file, encoding="utf-8") as f:
+            names.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    seen = set()
+    out = []
+    for name in map(_clean_username, names):
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            out.append(name)
+    return out
+
+
+def _fetch(username: str, args, limit: int, checkpoint: dict | None) -> tuple[str, list, str | None]:
+    """Return (status, results, error) for one user.
+
+    With a checkpoint, walks new() until the last-seen item (or anything older than
+    it, in case that item was deleted) instead of re-reading a fixed window.
+    """
+    try:
+        redditor = _client().redditor(username)
+        history = redditor.submissions if args.what == "posts" else redditor.comments
+
+        if checkpoint and checkpoint.get("newest"):
+            results = []
+            for item in history.new(limit=None):
+                if item.fullname == checkpoint["newest"] or item.created_utc <= checkpoint["newest_utc"]:
+                    break
+                results.append(item)
+            return "ok", results, None
+
+        return "ok", list(listing.fetch(history, args.sort, time_filter=args.time, limit=limit)), None
+    except prawcore.exceptions.Forbidden:
+        return "private", [], f"u/{username} has a private history — access denied."
+    except prawcore.exceptions.NotFound:
+        return "not_found", [], f"u/{username} not found."
+    except Exception as e:
+        return "error", [], f"Could not fetch user history for u/{username} — {e}"
 
 
 def run(args) -> int:
-    reddit = get_client()
-    username = args.username.lstrip("u/").lstrip("/")
     limit = min(args.limit, 100)
+    try:
+        usernames = _read_usernames(args)
+    except OSError as e:
+        sys.stderr.write(f"Error: Could not read users file — {e}\n")
+        return 2
+    if not usernames:
+        sys.stderr.write("Error: Provide at least one username (or --users-file).\n")
+        return 2
+    if args.since_checkpoint and args.sort != "new":
+        sys.stderr.write("Error: --since-checkpoint only works with --sort new.\n")
+        return 2
+
+    load_credentials()  # exits with the usual auth help before any worker starts
+    state = checkpoints.load() if args.since_checkpoint else {}
 
     if not args.quiet:
-        time_note = f" time={args.time}" if args.sort in ("top", "controversial") else ""
+        time_note = f" time={args.time}" if args.sort in listing.TIMED_SORTS else ""
+        who = f"u/{usernames[0]}" if len(usernames) == 1 else f"{len(usernames)} users"
+        sync_note = " since-checkpoint" if args.since_checkpoint else ""
         sys.stderr.write(
-            f"[user] u/{username} what={args.what} sort={args.sort}{time_note} limit={limit}\n"
+            f"[user] {who} what={args.what} sort={args.sort}{time_note} limit={limit}{sync_note}\n"
         )
         sys.stderr.flush()
 
+    todo = []
+    skipped = 0
+    for name in usernames:
+        cp = state.get(checkpoints.key(name, args.what))
+        if cp and cp.get("status") in checkpoints.UNREADABLE and not args.retry_failed:
+            skipped += 1
+            continue
+        todo.append((name, cp))
+
+    def fetch_one(job):
+        name, cp = job
+        with tracing.span("fetch", user=name):
+            return _fetch(name, args, limit, cp)
+
+    failed = 0
+    now = time.time()
+    sink = open_sink(args.output, args.what)
+    # (items yielded up to and including this user, checkpoint key, new entry)
+    pending = []
+    yielded = 0
+
+    def per_user(fetched):
+        """Yield each user's items in input order, staging their checkpoint entries."""
+        nonlocal failed, yielded
+        for (name, cp), (status, items, error) in zip(todo, fetched):
+            if error:
+                failed += 1
+                sys.stderr.write(f"Error: {error}\n")
+            yielded += len(items)
+            if args.since_checkpoint and status != "error":
+                entry = dict(cp or {}, status=status, checked=now)
+                if items:
+                    entry["newest"] = items[0].fullname
+                    entry["newest_utc"] = items[0].created_utc
+                pending.append((yielded, checkpoints.key(name, args.what), entry))
+            yield items
+        if todo and failed == len(todo):
+            raise _NothingReadable
+
+    extract, finish = (raw_post, post_record) if args.what == "posts" else (raw_comment, comment_record)
+    workers = max(1, min(args.concurrency, len(todo)))
     try:
-        redditor = reddit.redditor(username)
-        listing = redditor.submissions if args.what == "posts" else redditor.comments
-
-        if args.sort == "new":
-            gen = listing.new(limit=limit)
-        elif args.sort == "hot":
-            gen = listing.hot(limit=limit)
-        elif args.sort == "top":
-            gen = listing.top(time_filter=args.time, limit=limit)
-        else:  # controversial
-            gen = listing.controversial(time_filter=args.time, limit=limit)
-
-        results = list(gen)
-    except prawcore.exceptions.Forbidden:
-        sys.stderr.write(f"Error: u/{username} has a private history — access denied.\n")
-        return 1
-    except prawcore.exceptions.NotFound:
-        sys.stderr.write(f"Error: u/{username} not found.\n")
-        return 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # pool.map yields in input order as results complete, so the first
+            # user's items are written while later users are still being fetched.
+            with tracing.span("stream"):
+                count, first = listing.run(
+                    per_user(pool.map(fetch_one, todo)),
+                    extract=extract,
+                    finish=finish,
+                    sink=sink,
+                    workers=args.workers,
+                )
+    except _NothingReadable:
+        return 1  # each user's error is already reported
     except Exception as e:
-        sys.stderr.write(f"Error: Could not fetch user history — {e}\n")
+        sys.stderr.write(f"Error: User fetch failed — {e}\n")
         return 1
+    finally:
+        if args.since_checkpoint:
+            # A cursor only advances once all of that user's items reached the
+            # output; after a failure, later users are re-read next time
+            for end, cp_key, entry in pending:
+                if end > sink.flushed:
+                    break
+                state[cp_key] = entry
+            checkpoints.save(state)
 
     if not args.quiet:
-        sys.stderr.write(f"[user] {len(results)} {args.what}\n")
+        notes = []
+        if first is not None:
+            notes.append(f"first after {first:.2f}s")
+        if skipped:
+            notes.append(f"{skipped} private/missing users skipped")
+        note = f" ({', '.join(notes)})" if notes else ""
+        sys.stderr.write(f"[user] {count} {args.what}{note}\n")
         sys.stderr.flush()
 
-    if args.what == "posts":
-        items = [post_to_dict(p) for p in results]
-        if args.output == "json":
-            print_posts_json(items)
-        elif args.output == "csv":
-            print_posts_csv(items)
-        else:
-            print_posts_compact(items)
-    else:
-        items = []
-        for c in results:
-            d = comment_to_dict(c)
-            if d is not None:
-                items.append(d)
-        if args.output == "json":
-            print_comments_json(items)
-        else:
-            print_comments_compact(items)
-
     return 0
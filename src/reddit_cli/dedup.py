@@ -0,0 +1,136 @@
+"""Cross-query de-duplication of submissions, with optional near-duplicate title matching."""
+
+import math
+import random
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Tracking parameters that never change what a link points at.
+_TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src", "si", "feature"}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# MinHash signatures are split into bands of rows; two titles are compared only
+# if they agree on every row of some band. The layout is chosen per threshold:
+# titles at exactly the threshold must collide with probability _RECALL, using
+# at most _MAX_PERM hash values, and with as many rows per band as that allows so
+# dissimilar titles rarely share a bucket. At 0.8 this gives 12 bands of 4 rows.
+_RECALL = 0.998
+_MAX_PERM = 64
+MIN_THRESHOLD = 0.1  # below this a single-row layout would need more than _MAX_PERM
+_MIN_TOKENS = 3  # shorter titles are too generic to cluster meaningfully
+
+
+def _layout(threshold: float) -> tuple[int, int]:
+    """(bands, rows) for the most selective banding that still reaches _RECALL at threshold."""
+    best = (_MAX_PERM, 1)
+    for rows in range(1, _MAX_PERM + 1):
+        p = threshold ** rows  # chance one band of this many rows agrees
+        bands = 1 if p >= 1 else math.ceil(math.log(1 - _RECALL) / math.log(1 - p))
+        if bands * rows > _MAX_PERM:
+            break
+        best = (bands, rows)
+    return best
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a link: scheme-, www.-, fragment- and tracking-param-insensitive."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m.", "old.", "np."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+    )
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def _tokens(title: str) -> frozenset[str]:
+    return frozenset(_TOKEN_RE.findall(title.lower()))
+
+
+class _TitleLSH:
+    """Online MinHash/LSH index answering "have we seen a near-identical title?"."""
+
+    def __init__(self, threshold: float, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.threshold = threshold
+        bands, self._rows = _layout(threshold)
+        self._masks = [rng.getrandbits(64) for _ in range(bands * self._rows)]
+        self._buckets: list[dict[tuple, list[int]]] = [{} for _ in range(bands)]
+        self._token_sets: list[frozenset[str]] = []
+
+    def _signature(self, tokens: frozenset[str]) -> list[int]:
+        hashes = [hash(t) & 0xFFFFFFFFFFFFFFFF for t in tokens]
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def seen(self, title: str) -> bool:
+        """Return True if title is a near-duplicate of one already added; add it otherwise."""
+        tokens = _tokens(title)
+        if len(tokens) < _MIN_TOKENS:
+            return False
+        sig = self._signature(tokens)
+        rows = self._rows
+        bands = [tuple(sig[i:i + rows]) for i in range(0, len(sig), rows)]
+
+        candidates = set()
+        for bucket, band in zip(self._buckets, bands):
+            candidates.update(bucket.get(band, ()))
+        for idx in candidates:
+            other = self._token_sets[idx]
+            if len(tokens & other) / len(tokens | other) >= self.threshold:
+                return True
+
+        idx = len(self._token_sets)
+        self._token_sets.append(tokens)
+        for bucket, band in zip(self._buckets, bands):
+            bucket.setdefault(band, []).append(idx)
+        return False
+
+
+class Deduper:
+    """Drop submissions already seen in this run.
+
+    A post is a duplicate if its id, its crosspost parent, or its normalised link
+    URL matches an earlier post, or — when near_threshold is set — if its title has
+    at least that Jaccard similarity (over word sets) to an earlier title.
+    """
+
+    def __init__(self, *, near_threshold: float | None = None) -> None:
+        self._ids: set[str] = set()
+        self._urls: set[str] = set()
+        self._titles = _TitleLSH(near_threshold) if near_threshold else None
+        self.dropped = 0
+
+    def is_duplicate(self, post) -> bool:
+        # Listing items are fully loaded; read crosspost_parent from the instance
+        # dict so a missing attribute can't trigger a lazy fetch.
+        parent = vars(post).get("crosspost_parent")
+        parent_id = parent.split("_", 1)[-1] if parent else None
+        url = normalize_url(post.url) if not post.is_self else None
+
+        if (
+            post.id in self._ids
+            or (parent_id and parent_id in self._ids)
+            or (url and url in self._urls)
+            or (self._titles and self._titles.seen(post.title))
+        ):
+            self.dropped += 1
+            return True
+
+        self._ids.add(post.id)
+        if parent_id:
+            self._ids.add(parent_id)
+        if url:
+            self._urls.add(url)
+        return False
+
+    def filter(self, posts):
+        """Yield only the posts not seen before."""
+        for post in posts:
+            if not self.is_duplicate(post):
+                yield post
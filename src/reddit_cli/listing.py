@@ -0,0 +1,153 @@
+"""Shared listing pipeline: source → lazy pages → stages → extract → finish → sink.
+
+Listing commands only declare their sources (PRAW listing generators, which fetch
+one page of up to 100 items at a time as they are consumed). Items flow through
+optional generator stages (e.g. Deduper.filter), then conversion in two steps:
+extract() pulls the plain values an item needs out of its PRAW object (anything
+that may touch the network happens here), and finish() turns those into the
+output record. The record goes to a streaming sink, so the first item is written
+as soon as the first page arrives.
+
+With workers > 1, the first chunk of items is still written in process as it
+arrives; if the run outgrows it, a process pool takes over: later items are
+batched and marshalled to bytes, a worker finishes and renders them with the
+sink's own formatter, and the text is written back in submission order.
+"""
+
+import marshal
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from . import tracing
+from .output import encode_chunk
+
+# Sorts whose listing methods take a time_filter
+TIMED_SORTS = ("top", "controversial")
+
+
+def fetch(listing, sort: str, *, time_filter: str = "week", limit: int | None = 100):
+    """Return the lazy generator for listing.<sort>(), e.g. subreddit.hot(limit=...)."""
+    method = getattr(listing, sort)
+    if sort in TIMED_SORTS:
+        return method(time_filter=time_filter, limit=limit)
+    return method(limit=limit)
+
+
+# Items per worker chunk; matches a listing page, so runs of a single page
+# (feed, domain, one search query) never start the pool
+_CHUNK_ITEMS = 100
+
+
+def run(sources, *, extract, finish, sink, stages=(), workers: int = 1) -> tuple[int, float | None]:
+    """Drain sources through stages, extract and finish each item into sink.
+
+    extract(item) returns a marshal-safe dict (or None to skip the item); finish
+    must be picklable, e.g. a module-level function or a functools.partial of one.
+
+    Returns (items written, seconds until the first item was written — None if
+    there were none). The sink is closed even if a source raises mid-stream, so
+    structured output stays well-formed; the exception still propagates.
+    """
+    start = time.perf_counter()
+    first = None
+    items = chain.from_iterable(sources)
+    for stage in stages:
+        items = stage(items)
+
+    if workers > 1:
+        return _run_pool(items, extract, finish, sink, workers, start)
+
+    with sink:
+        for item in items:
+            raw = extract(item)
+            if raw is None:
+                continue
+            sink.write(finish(raw))
+            if first is None:
+                first = time.perf_counter() - start
+                tracing.mark("first_item", seconds=round(first, 4))
+    return sink.count, first
+
+
+# Set in each worker process by _init_worker()
+_worker: tuple = ()
+
+
+def _init_worker(finish, spec: tuple, color: bool) -> None:
+    global _worker
+    _worker = (finish, spec, color)
+
+
+def _finish_chunk(start: int, payload: bytes) -> str:
+    finish, spec, color = _worker
+    return encode_chunk(spec, color, start, [finish(raw) for raw in marshal.loads(payload)])
+
+
+def _run_pool(items, extract, finish, sink, workers: int, start: float) -> tuple[int, float | None]:
+    """run() with finish() and encoding fanned out to worker processes, order preserved.
+
+    PRAW objects stay in this process (they are lazy and may fetch on access);
+    only extracted plain values cross over, as one marshal payload per chunk. The
+    first chunk's worth of items is finished and written here one by one, exactly
+    as run() does, so small runs stream and never start the pool. After that, at
+    most 2 × workers chunks are in flight so memory stays bounded.
+    """
+    first = None
+    submitted = 0
+    pending = deque()
+    pool = None
+
+    def written() -> None:
+        nonlocal first
+        if first is None:
+            first = time.perf_counter() - start
+            tracing.mark("first_item", seconds=round(first, 4))
+
+    def drain(limit: int) -> None:
+        while len(pending) > limit:
+            future, n = pending.popleft()
+            sink.write_encoded(future.result(), n)
+
+    def submit(chunk: list) -> None:
+        nonlocal submitted
+        pending.append((pool.submit(_finish_chunk, submitted, marshal.dumps(chunk)), len(chunk)))
+        submitted += len(chunk)
+        drain(2 * workers)
+
+    chunk = []
+    with sink:
+        try:
+            for item in items:
+                raw = extract(item)
+                if raw is None:
+                    continue
+                if pool is None:
+                    if sink.count < _CHUNK_ITEMS:
+                        sink.write(finish(raw))
+                        written()
+                        continue
+                    # spawn, not fork: callers such as `user` already have fetch threads running
+                    pool = ProcessPoolExecutor(
+                        workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(finish, sink.spec, sink.r.color),
+                    )
+                    submitted = sink.count
+                chunk.append(raw)
+                if len(chunk) == _CHUNK_ITEMS:
+                    submit(chunk)
+                    chunk = []
+        finally:
+            # Whatever was extracted before a failure is still written
+            try:
+                if chunk:
+                    submit(chunk)
+                drain(0)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+    return sink.count, first
@@ -2,17 +2,23 @@
 """reddit-cli — search Reddit posts, subreddits, and threads via PRAW."""
 
 import argparse
+import cProfile
+import multiprocessing
 import os
+import pstats
 import sys
+from pathlib import Path
 
-from .commands import auth, comments, domain, feed, post, search, subreddits, user
+from . import dedup, tracing, tracklog, transport
+from .commands import auth, comments, domain, feed, post, search, stats, subreddits, track, user
 
 VERSION = "1.1.0"
 
 
 def _add_output_flag(parser: argparse.ArgumentParser, *, include_csv: bool = False) -> None:
-    choices = ["compact", "json", "csv"] if include_csv else ["compact", "json"]
-    help_text = "Output format: compact (default), json" + (", or csv" if include_csv else "")
+    """Listing commands (include_csv) stream their items and also offer csv and ndjson."""
+    choices = ["compact", "json", "csv", "ndjson"] if include_csv else ["compact", "json"]
+    help_text = "Output format: compact (default), json" + (", csv, or ndjson" if include_csv else "")
     parser.add_argument(
         "-o", "--output",
         choices=choices,
@@ -22,6 +28,16 @@ def _add_output_flag(parser: argparse.ArgumentParser, *, include_csv: bool = Fal
     )
 
 
+def _add_workers_flag(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Convert and render items in N worker processes once a pull passes 100 items, order kept (default: 1)",
+    )
+
+
 def _add_quiet_flag(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "-q", "--quiet",
@@ -47,6 +63,83 @@ def _add_sort_time_flags(parser: argparse.ArgumentParser, *, sorts: list[str], d
     )
 
 
+def _add_dedup_flags(parser: argparse.ArgumentParser) -> None:
+    """Add --dedup and --near-dup flags used by multi-source post commands."""
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Drop posts already seen in this run (same id, crosspost parent, or link URL)",
+    )
+    parser.add_argument(
+        "--near-dup",
+        type=_similarity,
+        nargs="?",
+        const=0.8,
+        default=None,
+        dest="near_dup",
+        metavar="THRESHOLD",
+        help="Also drop posts whose title is a near-duplicate (word Jaccard >= THRESHOLD, default 0.8); implies --dedup",
+    )
+
+
+def _similarity(value: str) -> float:
+    """argparse type for --near-dup: a Jaccard threshold the LSH layout supports."""
+    try:
+        threshold = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid threshold: {value!r}") from None
+    if not dedup.MIN_THRESHOLD <= threshold <= 1:
+        raise argparse.ArgumentTypeError(f"threshold must be between {dedup.MIN_THRESHOLD} and 1: {value!r}")
+    return threshold
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if n <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value!r}")
+    return n
+
+
+def _byte_size(value: str) -> int:
+    """argparse type for sizes like 500000, 512K, 50M or 1G (binary units)."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = value.strip().upper().removesuffix("B")
+    scale = units.get(text[-1:], 1)
+    try:
+        size = int(float(text[:-1] if scale > 1 else text) * scale)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r}") from None
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"size must be positive: {value!r}")
+    return size
+
+
+def _duration(value: str) -> float:
+    """argparse type for intervals like 90, 30s, 5m, 1h or 2d (bare numbers are seconds)."""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    text = value.strip().lower()
+    scale = units.get(text[-1:], 1)
+    try:
+        seconds = float(text[:-1] if text[-1:] in units else text) * scale
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r}") from None
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"duration must be positive: {value!r}")
+    return seconds
+
+
+def _add_match_flag(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--match-file",
+        metavar="FILE",
+        help="Keep only posts matching a keyword (one per line) or re:<regex> in FILE; adds a 'matched' field",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="reddit-cli",
@@ -57,27 +150,67 @@ examples:
   reddit-cli search "Claude Code skills"
   reddit-cli search "prompt engineering" -s LocalLLaMA --output json
   reddit-cli search "Midjourney v7" --days 7 --enrich --output json
+  reddit-cli search "megathread" --enrich --max-body-chars 2000 --max-enrich-bytes 5M --output json
   reddit-cli feed python --sort hot -n 10
+  reddit-cli feed technology -n 100 --match-file brands.txt --output ndjson
   reddit-cli feed all --sort top --time day --output csv
+  reddit-cli feed python -n 100 --output ndjson | jq .title
+  reddit-cli --replay archive/ user --users-file big.txt --output json --workers 8 > export.json
   reddit-cli user spez --what posts --sort new -n 10
   reddit-cli user spez --what comments --output json
+  reddit-cli user --users-file watchlist.txt --since-checkpoint --output csv
   reddit-cli domain github.com --sort top --time week
+  reddit-cli search "claude code" "claude cli" --near-dup --output json
   reddit-cli subreddits "AI coding tools" --by description
   reddit-cli subreddits --popular -n 10
+  reddit-cli subreddits --sync-index && reddit-cli subreddits local --local
   reddit-cli post 1abc2de
   reddit-cli comments 1abc2de --min-score 10 --depth 2
+  reddit-cli feed python --output csv | reddit-cli stats --by-subreddit
+  reddit-cli track watchlist.txt --interval 5m
+  reddit-cli track --rising 20 --window 6h
+  reddit-cli --trace run.trace.json feed python -n 100
+  reddit-cli --record session/ feed python -n 100 --output json
+  reddit-cli --replay session/ --profile feed python -n 100 --output json
   reddit-cli auth
+  reddit-cli auth --probe --timeout 2
         """,
     )
     parser.add_argument("--version", action="version", version=f"reddit-cli {VERSION}")
     parser.add_argument("--no-color", action="store_true", help="Disable ANSI color output")
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Write a Chrome trace-event JSON of HTTP requests and CLI phases to FILE",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run under cProfile and print the top hot spots to stderr",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use an HTTP/2 transport (needs the optional httpx[http2] dependency)",
+    )
+    session_io = parser.add_mutually_exclusive_group()
+    session_io.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Save every raw API response of this run to DIR for later --replay",
+    )
+    session_io.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve API responses from a --record DIR instead of the network",
+    )
 
     sub = parser.add_subparsers(dest="command", metavar="<command>")
     sub.required = True
 
     # ── search ──────────────────────────────────────────────────────────────
     p_search = sub.add_parser("search", help="Search posts across Reddit")
-    p_search.add_argument("query", help="Search query")
+    p_search.add_argument("query", nargs="+", help="Search query (several run in one pass; see --dedup)")
     p_search.add_argument(
         "-s", "--subreddit",
         default="all",
@@ -102,7 +235,7 @@ examples:
         type=int,
         default=25,
         metavar="N",
-        help="Max results, up to 100 (default: 25)",
+        help="Max results per query, up to 100 (default: 25)",
     )
     p_search.add_argument(
         "--enrich",
@@ -117,7 +250,24 @@ examples:
         metavar="N",
         help="Comments per post when --enrich is set (default: 5)",
     )
+    p_search.add_argument(
+        "--max-body-chars",
+        type=_positive_int,
+        default=None,
+        metavar="N",
+        help="With --enrich, truncate each post body and comment to N characters",
+    )
+    p_search.add_argument(
+        "--max-enrich-bytes",
+        type=_byte_size,
+        default=None,
+        metavar="SIZE",
+        help="With --enrich, stop enriching once bodies and comments total SIZE bytes (e.g. 500K, 20M)",
+    )
+    _add_dedup_flags(p_search)
+    _add_match_flag(p_search)
     _add_output_flag(p_search, include_csv=True)
+    _add_workers_flag(p_search)
     _add_quiet_flag(p_search)
 
     # ── feed ─────────────────────────────────────────────────────────────────
@@ -131,12 +281,20 @@ examples:
         metavar="N",
         help="Max posts, up to 100 (default: 25)",
     )
+    _add_match_flag(p_feed)
     _add_output_flag(p_feed, include_csv=True)
+    _add_workers_flag(p_feed)
     _add_quiet_flag(p_feed)
 
     # ── user ─────────────────────────────────────────────────────────────────
     p_user = sub.add_parser("user", help="Fetch a redditor's recent posts or comments")
-    p_user.add_argument("username", help="Reddit username (with or without u/ prefix)")
+    p_user.add_argument("username", nargs="*", help="Reddit username(s) (with or without u/ prefix)")
+    p_user.add_argument(
+        "--users-file",
+        dest="users_file",
+        metavar="FILE",
+        help="Read additional usernames from FILE, one per line",
+    )
     p_user.add_argument(
         "--what",
         choices=["posts", "comments"],
@@ -149,23 +307,46 @@ examples:
         type=int,
         default=25,
         metavar="N",
-        help="Max results, up to 100 (default: 25)",
+        help="Max results per user, up to 100 (default: 25)",
+    )
+    p_user.add_argument(
+        "--since-checkpoint",
+        action="store_true",
+        dest="since_checkpoint",
+        help="Only fetch items newer than the last run's checkpoint (sort=new); "
+             "private/missing users are remembered and skipped",
+    )
+    p_user.add_argument(
+        "--retry-failed",
+        action="store_true",
+        dest="retry_failed",
+        help="With --since-checkpoint, retry users previously found private or missing",
+    )
+    p_user.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Users fetched in parallel (default: 4)",
     )
     _add_output_flag(p_user, include_csv=True)
+    _add_workers_flag(p_user)
     _add_quiet_flag(p_user)
 
     # ── domain ───────────────────────────────────────────────────────────────
     p_domain = sub.add_parser("domain", help="Find Reddit posts linking to a domain")
-    p_domain.add_argument("domain", help="Domain name (e.g. github.com, nytimes.com)")
+    p_domain.add_argument("domain", nargs="+", help="Domain name(s) (e.g. github.com, nytimes.com)")
     _add_sort_time_flags(p_domain, sorts=["hot", "new", "rising", "top", "controversial"])
     p_domain.add_argument(
         "-n", "--limit",
         type=int,
         default=25,
         metavar="N",
-        help="Max posts, up to 100 (default: 25)",
+        help="Max posts per domain, up to 100 (default: 25)",
     )
+    _add_dedup_flags(p_domain)
     _add_output_flag(p_domain, include_csv=True)
+    _add_workers_flag(p_domain)
     _add_quiet_flag(p_domain)
 
     # ── subreddits ───────────────────────────────────────────────────────────
@@ -189,6 +370,25 @@ examples:
         metavar="N",
         help="Max results (default: 10)",
     )
+    p_subs.add_argument(
+        "--local",
+        action="store_true",
+        help="Answer from the local index (offline; name = prefix match, description = full-text)",
+    )
+    p_subs.add_argument(
+        "--sync-index",
+        action="store_true",
+        dest="sync_index",
+        help="Crawl popular and new subreddit listings into the local index, then exit",
+    )
+    p_subs.add_argument(
+        "--index-limit",
+        type=int,
+        default=1000,
+        dest="index_limit",
+        metavar="N",
+        help="Subreddits to crawl per listing with --sync-index (default: 1000)",
+    )
     _add_output_flag(p_subs)
     _add_quiet_flag(p_subs)
 
@@ -226,14 +426,104 @@ examples:
     _add_output_flag(p_comments)
     _add_quiet_flag(p_comments)
 
+    # ── stats ────────────────────────────────────────────────────────────────
+    p_stats = sub.add_parser("stats", help="Aggregate score/engagement stats over pulled JSON, NDJSON, or CSV")
+    p_stats.add_argument(
+        "file",
+        nargs="?",
+        default="-",
+        help="Input file, optionally .gz (default: - for stdin)",
+    )
+    p_stats.add_argument(
+        "--by-subreddit",
+        action="store_true",
+        dest="by_subreddit",
+        help="Also report stats per subreddit",
+    )
+    p_stats.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Top authors to list per group (default: 10)",
+    )
+    _add_output_flag(p_stats)
+    _add_quiet_flag(p_stats)
+
+    # ── track ────────────────────────────────────────────────────────────────
+    p_track = sub.add_parser("track", help="Snapshot post score/comments on an interval; query fastest rising")
+    p_track.add_argument(
+        "ids_file",
+        nargs="?",
+        default=None,
+        metavar="IDS_FILE",
+        help="File of post IDs or URLs to track, one per line (omit with --rising)",
+    )
+    p_track.add_argument(
+        "--interval",
+        type=_duration,
+        default=300.0,
+        help="Time between refreshes, e.g. 30s, 5m, 1h (default: 5m)",
+    )
+    p_track.add_argument(
+        "--once",
+        action="store_true",
+        help="Take a single snapshot and exit (for cron)",
+    )
+    p_track.add_argument(
+        "--log",
+        type=Path,
+        default=tracklog.PATH,
+        metavar="FILE",
+        help=f"Delta log to append to / query (default: {tracklog.PATH})",
+    )
+    p_track.add_argument(
+        "--rising",
+        type=_positive_int,
+        default=None,
+        metavar="N",
+        help="Print the N fastest-rising posts (score per hour) from the log and exit",
+    )
+    p_track.add_argument(
+        "--window",
+        type=_duration,
+        default=3600.0,
+        help="Look-back window for --rising, e.g. 30m, 6h (default: 1h)",
+    )
+    _add_output_flag(p_track)
+    _add_quiet_flag(p_track)
+
     # ── auth ─────────────────────────────────────────────────────────────────
     p_auth = sub.add_parser("auth", help="Verify Reddit credentials")
+    p_auth.add_argument(
+        "--probe",
+        action="store_true",
+        help="Fast health check: token fetch only (or a recent cached result), JSON latency/expiry on stdout",
+    )
+    p_auth.add_argument(
+        "--timeout",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Token request timeout for --probe (default: 5)",
+    )
+    p_auth.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=60.0,
+        dest="cache_ttl",
+        metavar="SECONDS",
+        help="Reuse a successful --probe result this recent while its token is unexpired; 0 disables (default: 60)",
+    )
     _add_quiet_flag(p_auth)
 
     return parser
 
 
 def main() -> None:
+    # In a frozen (PyInstaller) binary, --workers processes start by re-running
+    # this entry point; this hands them to the worker loop instead of argparse
+    multiprocessing.freeze_support()
     parser = build_parser()
     args = parser.parse_args()
 
@@ -253,6 +543,8 @@ def main() -> None:
         "subreddits": subreddits.run,
         "post": post.run,
         "comments": comments.run,
+        "stats": stats.run,
+        "track": track.run,
         "auth": auth.run,
     }
 
@@ -261,7 +553,38 @@ def main() -> None:
         parser.print_help(sys.stderr)
         sys.exit(2)
 
-    sys.exit(runner(args))
+    if args.http2 and not transport.http2_available():
+        sys.stderr.write("Error: --http2 needs httpx with HTTP/2 support: pip install 'reddit-cli[http2]'\n")
+        sys.exit(2)
+    if args.replay and not os.path.isfile(os.path.join(args.replay, transport.RECORDING_FILE)):
+        sys.stderr.write(f"Error: no recording in {args.replay} (create one with --record {args.replay})\n")
+        sys.exit(2)
+    transport.configure(
+        pool_size=getattr(args, "concurrency", 1),
+        http2=args.http2,
+        record=args.record,
+        replay=args.replay,
+    )
+
+    tracer = tracing.start() if args.trace else None
+    profiler = cProfile.Profile() if args.profile else None
+    try:
+        with tracing.span(args.command, "command"):
+            rc = profiler.runcall(runner, args) if profiler else runner(args)
+    finally:
+        if profiler:
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+        if tracer:
+            tracer.save(args.trace)
+            if not args.quiet:
+                t = tracer.summary()
+                sys.stderr.write(
+                    f"[trace] {t['requests']} requests · {t['bytes']:,} bytes "
+                    f"({t['wire_bytes']:,} on the wire) · {t['connections_opened']} connections, "
+                    f"{t['handshakes_avoided']} reused · {t['http_ms']:.0f} ms in HTTP → {args.trace}\n"
+                )
+
+    sys.exit(rc)
 
 
 if __name__ == "__main__":
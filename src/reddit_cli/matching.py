@@ -0,0 +1,131 @@
+"""Keyword and regex matching over streamed posts (--match-file).
+
+Keywords are folded into a character trie (``(?:py(?:thon|pi))``-style) compiled
+as one regex, so at each position the engine follows at most one branch per
+character instead of trying every keyword in turn: scanning cost grows with the
+text, not the keyword count. The trie sits inside a zero-width lookahead tried at
+every word start, so overlapping keywords ("new york" and "york") are all
+reported, as an Aho-Corasick scan would.
+
+Each re: pattern is searched separately, so regexes cost one search each per
+text. Python's re has no multi-pattern automaton: folding them into one
+alternation was measured 6-20× slower, since every branch is still tried at
+every position and the literal-prefix fast path is lost. A regex already
+matched earlier in the same post is not searched again.
+"""
+
+import re
+
+REGEX_PREFIX = "re:"
+
+_WORD = re.compile(r"\w")
+
+
+def _trie_pattern(words) -> str:
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of a keyword
+
+    def render(node: dict) -> str:
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            # A keyword ends here but longer ones continue: try the longer first
+            return f"(?:{body})?"
+        return body
+
+    return render(trie)
+
+
+def _is_boundary(word: str, i: int) -> bool:
+    """Whether a match of word[:i] could end at i, i.e. (?!\\w) holds there."""
+    return _WORD.match(word, i) is None
+
+
+class Matcher:
+    """Find which patterns from a --match-file occur in a post.
+
+    Plain lines are case-insensitive whole-word keywords; lines starting with
+    ``re:`` are case-insensitive regular expressions. Blank lines and ``#``
+    comments are ignored.
+    """
+
+    def __init__(self, keywords: list[str], regexes: list[str]) -> None:
+        # Lower-cased match text → keyword as written in the file
+        self._keywords = {k.lower(): k for k in keywords}
+        self._kw_re = None
+        if self._keywords:
+            trie = _trie_pattern(sorted(self._keywords))
+            self._kw_re = re.compile(rf"(?<!\w)(?=({trie})(?!\w))", re.IGNORECASE)
+        # The scan reports the longest keyword at each start; shorter keywords that
+        # end on a word boundary inside it ("new" in "new york") matched there too.
+        self._nested = {
+            k: [self._keywords[k[:i]] for i in range(1, len(k)) if k[:i] in self._keywords and _is_boundary(k, i)]
+            for k in self._keywords
+        }
+        self._regexes = [(f"{REGEX_PREFIX}{rx}", re.compile(rx, re.IGNORECASE)) for rx in regexes]
+        self._hits: dict[str, set[str]] = {}
+        self.dropped = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> "Matcher":
+        """Load patterns from path; raises ValueError naming the line of a bad regex."""
+        keywords, regexes = [], []
+        with open(path, encoding="utf-8") as f:
+            for lineno, raw in enumerate(f, 1):
+                line = raw.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith(REGEX_PREFIX):
+                    rx = line[len(REGEX_PREFIX):]
+                    try:
+                        re.compile(rx)
+                    except re.error as e:
+                        raise ValueError(f"{path}:{lineno}: bad regex {rx!r} — {e}") from None
+                    regexes.append(rx)
+                else:
+                    keywords.append(line)
+        return cls(keywords, regexes)
+
+    def find(self, text: str, found: set[str] | None = None) -> set[str]:
+        """Every pattern occurring anywhere in text, overlapping matches included.
+
+        Pass the hits from earlier text of the same post as found to add to them;
+        regexes already in it are not searched again.
+        """
+        if found is None:
+            found = set()
+        if not text:
+            return found
+        if self._kw_re is not None:
+            keywords, nested = self._keywords, self._nested
+            for m in self._kw_re.finditer(text):
+                hit = m.group(1).lower()
+                found.add(keywords[hit])
+                found.update(nested[hit])
+        for name, rx in self._regexes:
+            if name not in found and rx.search(text):
+                found.add(name)
+        return found
+
+    def filter(self, posts):
+        """Yield only posts whose title or selftext matches; keep their hits for take()."""
+        for post in posts:
+            found = self.find(post.selftext, self.find(post.title))
+            if found:
+                self._hits[post.id] = found
+                yield post
+            else:
+                self.dropped += 1
+
+    def take(self, post, comments: list | None = None) -> list[str]:
+        """Sorted patterns matched by a post that passed filter(), plus its comment bodies."""
+        found = self._hits.pop(post.id, set())
+        for c in comments or ():
+            self.find(c.get("body", ""), found)
+        return sorted(found)
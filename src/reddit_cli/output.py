@@ -1,28 +1,76 @@
 """Rendering helpers: compact lines, JSON, and CSV output."""
 
 import csv
+import io
 import json
 import os
 import sys
+import time
 from datetime import datetime, timezone
 from typing import Any
 
+# Buffered output is handed to the stream in chunks of roughly this many characters.
+_CHUNK_SIZE = 64 * 1024
+
+# Streaming sinks flush at least this often (seconds), so slow listings still show progress.
+_FLUSH_INTERVAL = 0.2
+
 
 # Honour NO_COLOR and --no-color (set via env after flag parsing)
-def _use_color() -> bool:
-    return sys.stdout.isatty() and not os.getenv("NO_COLOR") and os.getenv("REDDIT_CLI_NO_COLOR") != "1"
+def _use_color(stream=None) -> bool:
+    stream = stream or sys.stdout
+    return stream.isatty() and not os.getenv("NO_COLOR") and os.getenv("REDDIT_CLI_NO_COLOR") != "1"
+
+
+class Renderer:
+    """Buffered writer for one block of output.
+
+    Colour capability is resolved once at construction instead of per styled
+    fragment, and text is accumulated and handed to the stream in large chunks
+    rather than one print() (and, on a TTY, one flush) per line. Use as a context
+    manager, or call flush() when done.
+    """
+
+    def __init__(self, stream=None, *, chunk_size: int = _CHUNK_SIZE, color: bool | None = None) -> None:
+        self.stream = stream or sys.stdout
+        self.color = _use_color(self.stream) if color is None else color
+        self._chunk_size = chunk_size
+        self._buf: list[str] = []
+        self._size = 0
 
+    def dim(self, text: str) -> str:
+        return f"\033[2m{text}\033[0m" if self.color else text
 
-def _dim(text: str) -> str:
-    return f"\033[2m{text}\033[0m" if _use_color() else text
+    def bold(self, text: str) -> str:
+        return f"\033[1m{text}\033[0m" if self.color else text
 
+    def cyan(self, text: str) -> str:
+        return f"\033[36m{text}\033[0m" if self.color else text
 
-def _bold(text: str) -> str:
-    return f"\033[1m{text}\033[0m" if _use_color() else text
+    def write(self, text: str) -> None:
+        self._buf.append(text)
+        self._size += len(text)
+        if self._size >= self._chunk_size:
+            self._drain()
 
+    def line(self, text: str = "") -> None:
+        self.write(text + "\n")
 
-def _cyan(text: str) -> str:
-    return f"\033[36m{text}\033[0m" if _use_color() else text
+    def _drain(self) -> None:
+        if self._buf:
+            self.stream.write("".join(self._buf))
+            self._buf.clear()
+            self._size = 0
+
+    def flush(self) -> None:
+        self._drain()
+        self.stream.flush()
+
+    def __enter__(self) -> "Renderer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
 
 
 def format_ts(utc_ts: float) -> str:
@@ -30,60 +78,73 @@ def format_ts(utc_ts: float) -> str:
     return datetime.fromtimestamp(utc_ts, tz=timezone.utc).strftime("%Y-%m-%d")
 
 
+def _write_json(key: str, items: Any) -> None:
+    with Renderer() as r:
+        r.line(json.dumps({key: items}, indent=2))
+
+
 # ---------------------------------------------------------------------------
 # Post (search result / single post)
 # ---------------------------------------------------------------------------
 
-def post_to_dict(post, *, include_selftext: bool = False, comments: list | None = None) -> dict:
-    d = {
-        "id": post.id,
-        "title": post.title,
-        "url": f"https://www.reddit.com{post.permalink}",
-        "subreddit": post.subreddit.display_name,
-        "score": post.score,
-        "num_comments": post.num_comments,
-        "author": post.author.name if post.author else None,
-        "date": format_ts(post.created_utc),
-        "upvote_ratio": post.upvote_ratio,
+def raw_post(post, *, include_selftext: bool = False) -> dict:
+    """The listing fields post_record() needs, as plain values (safe to marshal).
+
+    Read from the instance dict: listing items are fully loaded, so this never
+    triggers a fetch. PRAW has already wrapped subreddit and author in objects.
+    """
+    data = vars(post)
+    author = data.get("author")
+    raw = {
+        "id": data["id"],
+        "title": data["title"],
+        "permalink": data["permalink"],
+        "subreddit": str(data["subreddit"]),
+        "score": data["score"],
+        "num_comments": data["num_comments"],
+        "author": str(author) if author else None,
+        "created_utc": data["created_utc"],
+        "upvote_ratio": data["upvote_ratio"],
     }
     if include_selftext:
-        d["selftext"] = post.selftext or ""
+        raw["selftext"] = data.get("selftext") or ""
+    return raw
+
+
+def post_record(raw: dict, *, comments: list | None = None) -> dict:
+    """Output record for a raw_post(); selftext and matched carry over when present."""
+    d = {
+        "id": raw["id"],
+        "title": raw["title"],
+        "url": f"https://www.reddit.com{raw['permalink']}",
+        "subreddit": raw["subreddit"],
+        "score": raw["score"],
+        "num_comments": raw["num_comments"],
+        "author": raw["author"],
+        "date": format_ts(raw["created_utc"]),
+        "upvote_ratio": raw["upvote_ratio"],
+    }
+    if "selftext" in raw:
+        d["selftext"] = raw["selftext"]
     if comments is not None:
         d["comments"] = comments
+    if "matched" in raw:
+        d["matched"] = raw["matched"]
     return d
 
 
-def print_post_compact(d: dict) -> None:
-    score = _bold(f"[{d['score']:>6}]")
-    sub = _cyan(f"r/{d['subreddit']}")
-    print(f"{score} {sub} · {d['title']}")
-    print(f"         {_dim(d['url'])}")
-
-
-def print_posts_compact(items: list[dict]) -> None:
-    for d in items:
-        print_post_compact(d)
-
-
-def print_posts_json(items: list[dict]) -> None:
-    # Schema matches last30days openai_reddit parser expectations
-    print(json.dumps({"items": items}, indent=2))
+def render_post_compact(r: Renderer, d: dict) -> None:
+    score = r.bold(f"[{d['score']:>6}]")
+    sub = r.cyan(f"r/{d['subreddit']}")
+    r.line(f"{score} {sub} · {d['title']}")
+    r.line(f"         {r.dim(d['url'])}")
+    if d.get("matched"):
+        r.line(f"         {r.dim('matched:')} {r.cyan(', '.join(d['matched']))}")
 
 
 _CSV_FIELDS = ["id", "title", "score", "num_comments", "upvote_ratio", "author", "date", "subreddit", "url"]
 
 
-def print_posts_csv(items: list[dict]) -> None:
-    writer = csv.DictWriter(
-        sys.stdout,
-        fieldnames=_CSV_FIELDS,
-        extrasaction="ignore",
-        lineterminator="\n",
-    )
-    writer.writeheader()
-    writer.writerows(items)
-
-
 # ---------------------------------------------------------------------------
 # Subreddits
 # ---------------------------------------------------------------------------
@@ -99,50 +160,285 @@ def subreddit_to_dict(sub) -> dict:
 
 
 def print_subreddits_compact(items: list[dict]) -> None:
-    for s in items:
-        subs = f"{s['subscribers']:,}" if s["subscribers"] else "?"
-        print(f"{_cyan('r/' + s['name'])} ({subs} members)")
-        if s["public_description"]:
-            print(f"  {_dim(s['public_description'][:120])}")
-        print(f"  {_dim(s['url'])}")
+    with Renderer() as r:
+        for s in items:
+            subs = f"{s['subscribers']:,}" if s["subscribers"] else "?"
+            r.line(f"{r.cyan('r/' + s['name'])} ({subs} members)")
+            if s["public_description"]:
+                r.line(f"  {r.dim(s['public_description'][:120])}")
+            r.line(f"  {r.dim(s['url'])}")
 
 
 def print_subreddits_json(items: list[dict]) -> None:
-    print(json.dumps({"subreddits": items}, indent=2))
+    _write_json("subreddits", items)
 
 
 # ---------------------------------------------------------------------------
 # Comments
 # ---------------------------------------------------------------------------
 
-def comment_to_dict(comment, depth: int = 0) -> dict | None:
-    try:
-        body = comment.body
-    except AttributeError:
-        return None  # MoreComments stub
+def raw_comment(comment) -> dict | None:
+    """The fields comment_record() needs as plain values; None for a MoreComments stub."""
+    data = vars(comment)
+    if "body" not in data:
+        return None
+    author = data.get("author")
     return {
-        "id": comment.id,
-        "author": comment.author.name if comment.author else None,
-        "score": comment.score,
-        "date": format_ts(comment.created_utc),
-        "body": body,
+        "id": data["id"],
+        "author": str(author) if author else None,
+        "score": data["score"],
+        "created_utc": data["created_utc"],
+        "body": data["body"],
+    }
+
+
+def comment_record(raw: dict, depth: int = 0) -> dict:
+    return {
+        "id": raw["id"],
+        "author": raw["author"],
+        "score": raw["score"],
+        "date": format_ts(raw["created_utc"]),
+        "body": raw["body"],
         "depth": depth,
     }
 
 
+def comment_to_dict(comment, depth: int = 0) -> dict | None:
+    raw = raw_comment(comment)
+    return comment_record(raw, depth) if raw is not None else None
+
+
+def render_comment_compact(r: Renderer, c: dict) -> None:
+    indent = "  " * c.get("depth", 0)
+    author = c["author"] or "[deleted]"
+    score = r.bold(f"[{c['score']}]")
+    r.line(f"{indent}{score} {r.dim('u/' + author)} · {r.dim(c['date'])}")
+    for line in c["body"].splitlines():
+        r.line(f"{indent}  {line}")
+    r.line()
+
+
 def print_comments_compact(items: list[dict]) -> None:
-    for c in items:
-        indent = "  " * c.get("depth", 0)
-        author = c["author"] or "[deleted]"
-        score = _bold(f"[{c['score']}]")
-        print(f"{indent}{score} {_dim('u/' + author)} · {_dim(c['date'])}")
-        for line in c["body"].splitlines():
-            print(f"{indent}  {line}")
-        print()
+    with Renderer() as r:
+        for c in items:
+            render_comment_compact(r, c)
 
 
 def print_comments_json(items: list[dict]) -> None:
-    print(json.dumps({"comments": items}, indent=2))
+    _write_json("comments", items)
+
+
+# ---------------------------------------------------------------------------
+# Streaming sinks
+# ---------------------------------------------------------------------------
+
+class _Sink:
+    """Write items one at a time as they arrive; close() finishes the document.
+
+    The first item is flushed immediately and later ones at least every
+    _FLUSH_INTERVAL seconds, so output appears as soon as the first page lands
+    without paying a syscall per item.
+    """
+
+    def __init__(self, stream=None, color: bool | None = None) -> None:
+        self.r = Renderer(stream, color=color)
+        self.count = 0
+        self.flushed = 0  # items known to have reached the stream
+        self._started = False
+        self._last_flush = time.monotonic()
+        self.spec: tuple = ()  # open_sink() arguments, so a worker can rebuild the encoder
+
+    def _begin(self) -> None:
+        pass
+
+    def _item(self, d: dict) -> None:
+        raise NotImplementedError
+
+    def _end(self) -> None:
+        pass
+
+    def _start(self) -> None:
+        if not self._started:
+            self._started = True
+            self._begin()
+
+    def write(self, d: dict) -> None:
+        self._start()
+        self._item(d)
+        self._advance(1)
+
+    def write_encoded(self, text: str, n: int) -> None:
+        """Write n items already rendered by encode_chunk()."""
+        self._start()
+        self.r.write(text)
+        self._advance(n)
+
+    def _advance(self, n: int) -> None:
+        first = self.count == 0
+        self.count += n
+        now = time.monotonic()
+        if first or now - self._last_flush >= _FLUSH_INTERVAL:
+            self.r.flush()
+            self.flushed = self.count
+            self._last_flush = now
+
+    def __enter__(self) -> "_Sink":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        # The header waits for the first item, so a run that fails before any
+        # leaves stdout empty; an empty successful run still gets a document
+        if exc_type is not None and not self._started:
+            return
+        self._start()
+        self._end()
+        self.r.flush()
+        self.flushed = self.count
+
+
+class _CompactSink(_Sink):
+    def __init__(self, render_fn, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._render = render_fn
+
+    def _item(self, d: dict) -> None:
+        self._render(self.r, d)
+
+
+class _NDJSONSink(_Sink):
+    def _item(self, d: dict) -> None:
+        self.r.line(json.dumps(d))
+
+
+class _JSONSink(_Sink):
+    """Streams {"<key>": [...]} byte-identical to json.dumps(..., indent=2)."""
+
+    def __init__(self, key: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._key = key
+
+    def _begin(self) -> None:
+        self.r.write(f'{{\n  {json.dumps(self._key)}: [')
+
+    def _item(self, d: dict) -> None:
+        body = json.dumps(d, indent=2).replace("\n", "\n    ")
+        self.r.write(("," if self.count else "") + "\n    " + body)
+
+    def _end(self) -> None:
+        self.r.write("\n  ]\n}\n" if self.count else "]\n}\n")
+
+
+class _CSVSink(_Sink):
+    def __init__(self, fields: list[str] = _CSV_FIELDS, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._writer = csv.DictWriter(
+            self.r,
+            fieldnames=fields,
+            extrasaction="ignore",
+            lineterminator="\n",
+        )
+
+    def _begin(self) -> None:
+        self._writer.writeheader()
+
+    def _item(self, d: dict) -> None:
+        if "matched" in d:
+            d = {**d, "matched": "; ".join(d["matched"])}
+        self._writer.writerow(d)
+
+
+def open_sink(fmt: str, kind: str = "posts", *, matched: bool = False, stream=None, color: bool | None = None) -> _Sink:
+    """Streaming writer for posts or comments in compact, json, csv, or ndjson format.
+
+    matched adds the --match-file column to CSV; the other formats carry it as-is.
+    """
+    sink = _make_sink(fmt, kind, matched, stream=stream, color=color)
+    sink.spec = (fmt, kind, matched)
+    return sink
+
+
+def _make_sink(fmt: str, kind: str, matched: bool, **kwargs) -> _Sink:
+    if fmt == "ndjson":
+        return _NDJSONSink(**kwargs)
+    if fmt == "json":
+        # Post schema matches last30days openai_reddit parser expectations
+        return _JSONSink("items" if kind == "posts" else "comments", **kwargs)
+    if kind == "posts":
+        if fmt == "csv":
+            return _CSVSink(_CSV_FIELDS + ["matched"] if matched else _CSV_FIELDS, **kwargs)
+        return _CompactSink(render_post_compact, **kwargs)
+    return _CompactSink(render_comment_compact, **kwargs)  # comments have no CSV layout
+
+
+def encode_chunk(spec: tuple, color: bool, start: int, items: list[dict]) -> str:
+    """Render items exactly as the live sink with this spec would (--workers).
+
+    Runs in a worker process: a private sink renders into memory, positioned at
+    item index start so separators match, and the text goes back to be written.
+    """
+    fmt, kind, matched = spec
+    buf = io.StringIO()
+    sink = _make_sink(fmt, kind, matched, stream=buf, color=color)
+    sink.count = start
+    for d in items:
+        sink._item(d)
+        sink.count += 1
+    sink.r._drain()
+    return buf.getvalue()
+
+
+# ---------------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------------
+
+def _render_stats_group(r: Renderer, label: str, g: dict) -> None:
+    r.line(f"{r.cyan(label)} · {g['count']:,} items")
+    if "score" in g:
+        s = g["score"]
+        pcts = " · ".join(f"p{k[1:]} {v:,g}" for k, v in s.items() if k.startswith("p"))
+        r.line(f"  {r.dim('score')}     {pcts} · max {s['max']:,g} · mean {s['mean']:,g}")
+    if g.get("comments_per_upvote") is not None:
+        r.line(f"  {r.dim('comments/upvote')} {g['comments_per_upvote']}")
+    if "upvote_ratio_mean" in g:
+        r.line(f"  {r.dim('upvote ratio')} {g['upvote_ratio_mean']:.0%} mean")
+    if any(g["weekday"].values()):
+        days = " · ".join(f"{day} {n:,}" for day, n in g["weekday"].items())
+        r.line(f"  {r.dim('weekday')}   {days}")
+    if g["top_authors"]:
+        authors = " · ".join(f"u/{a['author']} ({a['count']})" for a in g["top_authors"])
+        r.line(f"  {r.dim('authors')}   {authors}")
+
+
+def print_stats_compact(stats: dict) -> None:
+    with Renderer() as r:
+        _render_stats_group(r, "all", stats["overall"])
+        for name, g in stats.get("subreddits", {}).items():
+            r.line()
+            _render_stats_group(r, f"r/{name}", g)
+
+
+def print_stats_json(stats: dict) -> None:
+    _write_json("stats", stats)
+
+
+# ---------------------------------------------------------------------------
+# Track
+# ---------------------------------------------------------------------------
+
+def print_rising_compact(rows: list[dict]) -> None:
+    with Renderer() as r:
+        for d in rows:
+            rate = r.bold(f"[{d['score_per_hour']:>+8.1f}/h]")
+            tracked = r.dim(f"{d['hours']:g}h tracked")
+            r.line(
+                f"{rate} score {d['score']:,} · {d['num_comments']:,} comments "
+                f"({d['comments_per_hour']:+.1f}/h) · {d['upvote_ratio']:.0%} · {tracked}"
+            )
+            r.line(f"             {r.dim(d['url'])}")
+
+
+def print_rising_json(rows: list[dict]) -> None:
+    _write_json("rising", rows)
 
 
 # ---------------------------------------------------------------------------
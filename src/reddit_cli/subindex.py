@@ -0,0 +1,146 @@
+"""Local subreddit metadata index for offline `subreddits --local` lookups."""
+
+import bisect
+import gzip
+import heapq
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from .output import format_ts
+
+_PATH = Path.home() / ".config" / "reddit-cli" / "subreddits-index.json.gz"
+_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def record_from_subreddit(sub) -> tuple[str, int, str, int]:
+    """(name, subscribers, description, created) from a listing Subreddit.
+
+    Listing items are already loaded, so attributes are read from the instance dict
+    rather than via getattr, which would trigger a lazy fetch for missing fields.
+    """
+    data = vars(sub)
+    return (
+        sub.display_name,
+        data.get("subscribers") or 0,
+        data.get("public_description") or "",
+        int(data.get("created_utc") or 0),
+    )
+
+
+class SubredditIndex:
+    """Columnar subreddit index, kept sorted by lowercase name.
+
+    Prefix queries bisect the sorted name column, which answers the same question
+    as walking a trie without building one per run; full-text queries use an
+    inverted index over name and description tokens, built lazily on first use.
+    """
+
+    def __init__(self, records=(), synced: float | None = None) -> None:
+        rows = sorted(records, key=lambda r: r[0].lower())
+        self.names = [r[0] for r in rows]
+        self.subscribers = [r[1] for r in rows]
+        self.descriptions = [r[2] for r in rows]
+        self.created = [r[3] for r in rows]
+        self.synced = synced
+        self._lower = [n.lower() for n in self.names]
+        self._postings: dict[str, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def records(self):
+        return zip(self.names, self.subscribers, self.descriptions, self.created)
+
+    def merge(self, records) -> "SubredditIndex":
+        """Return a new index with records added, replacing entries of the same name."""
+        by_name = {r[0].lower(): r for r in self.records()}
+        by_name.update((r[0].lower(), r) for r in records)
+        return SubredditIndex(by_name.values(), synced=time.time())
+
+    # ── persistence ────────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, path: Path = _PATH) -> "SubredditIndex":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            doc = json.load(f)
+        if doc.get("version") != _VERSION:
+            raise ValueError(f"unsupported index version {doc.get('version')!r}; re-run --sync-index")
+        idx = cls.__new__(cls)
+        idx.names = doc["names"]
+        idx.subscribers = doc["subscribers"]
+        idx.descriptions = doc["descriptions"]
+        idx.created = doc["created"]
+        idx.synced = doc.get("synced")
+        idx._lower = [n.lower() for n in idx.names]  # stored pre-sorted; no re-sort on load
+        idx._postings = None
+        return idx
+
+    def save(self, path: Path = _PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        doc = {
+            "version": _VERSION,
+            "synced": self.synced,
+            "names": self.names,
+            "subscribers": self.subscribers,
+            "descriptions": self.descriptions,
+            "created": self.created,
+        }
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(doc, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    # ── queries ────────────────────────────────────────────────────────────
+
+    def _ranked(self, positions, limit: int) -> list[int]:
+        return heapq.nlargest(limit, positions, key=self.subscribers.__getitem__)
+
+    def prefix(self, query: str, limit: int) -> list[int]:
+        q = query.lower().removeprefix("r/")
+        lo = bisect.bisect_left(self._lower, q)
+        hi = bisect.bisect_left(self._lower, q + "\uffff", lo)
+        return self._ranked(range(lo, hi), limit)
+
+    def _build_postings(self) -> dict[str, list[int]]:
+        postings: dict[str, list[int]] = defaultdict(list)
+        for i, (name, desc) in enumerate(zip(self.names, self.descriptions)):
+            for tok in _tokens(name) | _tokens(desc):
+                postings[tok].append(i)
+        return postings
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """Subreddits whose name or description contains every query token."""
+        if self._postings is None:
+            self._postings = self._build_postings()
+        toks = sorted(_tokens(query), key=lambda t: len(self._postings.get(t, ())))
+        if not toks:
+            return []
+        hits = set(self._postings.get(toks[0], ()))
+        for tok in toks[1:]:
+            if not hits:
+                break
+            hits.intersection_update(self._postings.get(tok, ()))
+        return self._ranked(hits, limit)
+
+    def popular(self, limit: int) -> list[int]:
+        return self._ranked(range(len(self)), limit)
+
+    def to_dict(self, i: int) -> dict:
+        """Same shape as output.subreddit_to_dict."""
+        return {
+            "name": self.names[i],
+            "url": f"https://www.reddit.com/r/{self.names[i]}/",
+            "subscribers": self.subscribers[i] or None,
+            "public_description": self.descriptions[i],
+            "created_utc": format_ts(self.created[i]),
+        }
@@ -0,0 +1,148 @@
+"""Opt-in request and phase tracing (--trace) in Chrome trace-event format.
+
+Spans are recorded only after start() is called; until then span() hands back a
+shared no-op, so instrumented code costs one global lookup per phase. The saved
+file loads in chrome://tracing, Perfetto, and other trace-event viewers.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from prawcore import Requestor
+
+from . import transport
+
+_tracer: "Tracer | None" = None
+
+# Response headers worth keeping on each HTTP span
+_RATELIMIT_HEADERS = ("x-ratelimit-remaining", "x-ratelimit-used", "x-ratelimit-reset")
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+        self._pid = os.getpid()
+        self._origin_ns = time.perf_counter_ns()
+
+    def _us(self, ns: int) -> float:
+        return (ns - self._origin_ns) / 1000
+
+    def add(self, name: str, cat: str, start_ns: int, end_ns: int, args: dict) -> None:
+        self.events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self._us(start_ns),
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+    def instant(self, name: str, cat: str = "mark", **args) -> None:
+        self.events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "t",
+            "ts": self._us(time.perf_counter_ns()),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+    def summary(self) -> dict:
+        http = [e for e in self.events if e["cat"] == "http"]
+        conns = transport.connection_stats()
+        return {
+            "requests": len(http),
+            "bytes": sum(e["args"].get("bytes", 0) for e in http),
+            "wire_bytes": sum(e["args"].get("wire_bytes", e["args"].get("bytes", 0)) for e in http),
+            "http_ms": round(sum(e["dur"] for e in http) / 1000, 3),
+            **conns,
+            "handshakes_avoided": max(0, conns["pooled_requests"] - conns["connections_opened"]),
+        }
+
+    def save(self, path: str) -> None:
+        doc = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"tool": "reddit-cli", **self.summary()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "_start")
+
+    def __init__(self, name: str, cat: str, args: dict) -> None:
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> dict:
+        self._start = time.perf_counter_ns()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        tracer = _tracer
+        if tracer is not None:
+            tracer.add(self.name, self.cat, self._start, time.perf_counter_ns(), self.args)
+
+
+class _NullSpan:
+    def __enter__(self) -> dict:
+        return {}  # callers may annotate the span; discarded
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def start() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def active() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, cat: str = "phase", **args):
+    """Context manager timing one phase; yields a dict for extra span args."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def mark(name: str, **args) -> None:
+    """Record a point-in-time event (e.g. first item rendered)."""
+    if _tracer is not None:
+        _tracer.instant(name, **args)
+
+
+class TracingRequestor(Requestor):
+    """prawcore Requestor that records one span per HTTP request."""
+
+    def request(self, *args, **kwargs):
+        method, url = args[0], args[1]
+        with span(f"{method.upper()} {urlsplit(url).path}", "http", method=method.upper(), url=url) as info:
+            response = super().request(*args, **kwargs)
+            info["status"] = response.status_code
+            info["bytes"] = len(response.content)
+            wire = transport.wire_bytes(response)
+            if wire is not None:
+                info["wire_bytes"] = wire
+            for header in _RATELIMIT_HEADERS:
+                if header in response.headers:
+                    info[header] = response.headers[header]
+        return response
@@ -0,0 +1,174 @@
+"""Append-only binary log of post engagement deltas for `track`.
+
+Layout: a 5-byte header (b"RCTL" + version), then one block per refresh cycle:
+
+    <d I>              cycle timestamp (unix seconds), number of entries
+    <Q i i h> × n      post id (base36 → int), Δscore, Δnum_comments, Δupvote_ratio (‰)
+
+Only posts whose numbers changed since the previous cycle get an entry; the
+first sighting of a post is a delta from zero. Reading sums deltas back into
+current values, so a cycle with no movement costs 12 bytes however many posts
+are tracked. A block torn by an interrupted write is ignored on read.
+"""
+
+import struct
+from pathlib import Path
+
+PATH = Path.home() / ".config" / "reddit-cli" / "track.log"
+
+_MAGIC = b"RCTL\x01"
+_CYCLE = struct.Struct("<dI")
+_ENTRY = struct.Struct("<Qiih")
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def id_to_int(post_id: str) -> int:
+    return int(post_id, 36)
+
+
+def int_to_id(n: int) -> str:
+    out = []
+    while True:
+        n, r = divmod(n, 36)
+        out.append(_DIGITS[r])
+        if not n:
+            return "".join(reversed(out))
+
+
+def _blocks(path: Path) -> tuple[memoryview, list[tuple[float, int, int]]]:
+    """The log's bytes and (timestamp, start, end) of each complete cycle's entries."""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return memoryview(b""), []
+    if not data.startswith(_MAGIC):
+        raise ValueError(f"{path} is not a track log")
+    view = memoryview(data)
+    blocks = []
+    pos = len(_MAGIC)
+    while pos + _CYCLE.size <= len(data):
+        ts, n = _CYCLE.unpack_from(view, pos)
+        start = pos + _CYCLE.size
+        end = start + n * _ENTRY.size
+        if end > len(data):
+            break  # torn tail from an interrupted append
+        blocks.append((ts, start, end))
+        pos = end
+    return view, blocks
+
+
+def read_cycles(path: Path = PATH):
+    """Yield (timestamp, iterator of (id, Δscore, Δcomments, Δratio‰)) per complete cycle."""
+    view, blocks = _blocks(path)
+    for ts, start, end in blocks:
+        yield ts, _ENTRY.iter_unpack(view[start:end])
+
+
+class TrackLog:
+    """Current per-post values rebuilt from the log, plus appending new cycles."""
+
+    def __init__(self, path: Path = PATH) -> None:
+        self.path = path
+        # id → [score, num_comments, upvote_ratio‰]
+        self.state: dict[int, list[int]] = {}
+        self.cycles = 0
+        for _, entries in read_cycles(path):
+            self._apply(entries)
+            self.cycles += 1
+
+    def _apply(self, entries) -> None:
+        state = self.state
+        for pid, ds, dc, dr in entries:
+            cur = state.get(pid)
+            if cur is None:
+                state[pid] = [ds, dc, dr]
+            else:
+                cur[0] += ds
+                cur[1] += dc
+                cur[2] += dr
+
+    def append(self, ts: float, observed) -> int:
+        """Record one cycle of (post id, score, num_comments, upvote_ratio); returns entries written."""
+        state = self.state
+        pack = _ENTRY.pack
+        chunks = []
+        for post_id, score, comments, ratio in observed:
+            pid = id_to_int(post_id)
+            permille = round(ratio * 1000)
+            cur = state.get(pid)
+            if cur is None:
+                state[pid] = [score, comments, permille]
+                chunks.append(pack(pid, score, comments, permille))
+            elif cur[0] != score or cur[1] != comments or cur[2] != permille:
+                chunks.append(pack(pid, score - cur[0], comments - cur[1], permille - cur[2]))
+                cur[0], cur[1], cur[2] = score, comments, permille
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            if f.tell() == 0:
+                f.write(_MAGIC)
+            # One write per cycle keeps a crash from interleaving partial blocks
+            f.write(_CYCLE.pack(ts, len(chunks)) + b"".join(chunks))
+        self.cycles += 1
+        return len(chunks)
+
+
+def velocities(path: Path = PATH, *, window: float) -> tuple[list[dict], float | None]:
+    """Per-post change rates over the last `window` seconds of the log, in one pass.
+
+    Each post is measured from its values at the last cycle before the window
+    opened, or from its first sighting if that came later. Returns (rows, time of
+    the last cycle) — rows are unordered.
+    """
+    view, blocks = _blocks(path)
+    if not blocks:
+        return [], None
+    last_ts = blocks[-1][0]
+    cutoff = last_ts - window
+
+    state: dict[int, list[int]] = {}
+    # id → (ts, values) at first sighting; a first entry is a delta from zero
+    first: dict[int, tuple] = {}
+    base: dict[int, tuple] = {}
+    base_ts = prev_ts = None
+    in_window = False
+
+    for ts, start, end in blocks:
+        if not in_window and ts > cutoff:
+            in_window = True
+            base = {pid: tuple(v) for pid, v in state.items()}
+            base_ts = prev_ts
+        for pid, ds, dc, dr in _ENTRY.iter_unpack(view[start:end]):
+            cur = state.get(pid)
+            if cur is None:
+                state[pid] = [ds, dc, dr]
+                first[pid] = (ts, (ds, dc, dr))
+            else:
+                cur[0] += ds
+                cur[1] += dc
+                cur[2] += dr
+        prev_ts = ts
+
+    rows = []
+    for pid, (score, comments, permille) in state.items():
+        start = base.get(pid)
+        if start is not None:
+            since = base_ts
+        else:
+            since, start = first[pid]
+        hours = (last_ts - since) / 3600
+        if hours <= 0:
+            continue  # seen only in the latest cycle
+        post_id = int_to_id(pid)
+        rows.append({
+            "id": post_id,
+            "url": f"https://www.reddit.com/comments/{post_id}",
+            "score": score,
+            "num_comments": comments,
+            "upvote_ratio": permille / 1000,
+            "score_per_hour": round((score - start[0]) / hours, 2),
+            "comments_per_hour": round((comments - start[1]) / hours, 2),
+            "hours": round(hours, 2),
+        })
+    return rows, last_ts
@@ -0,0 +1,291 @@
+"""HTTP session shared by every Reddit client built during one run."""
+
+import base64
+import json
+import os
+import socket
+import threading
+from collections import defaultdict, deque
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection
+
+# Set from CLI flags in main() before any client is built.
+_pool_size = 1
+_http2 = False
+_record_dir: str | None = None
+_replay_dir: str | None = None
+
+_session: requests.Session | None = None
+
+# One exchange per line, in the order responses arrived
+RECORDING_FILE = "exchanges.ndjson"
+
+
+def configure(
+    *,
+    pool_size: int = 1,
+    http2: bool = False,
+    record: str | None = None,
+    replay: str | None = None,
+) -> None:
+    global _pool_size, _http2, _record_dir, _replay_dir, _session
+    _pool_size = max(1, pool_size)
+    _http2 = http2
+    _record_dir = record
+    _replay_dir = replay
+    _session = None
+
+
+def replaying() -> bool:
+    return _replay_dir is not None
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets use TCP keep-alive, so idle connections survive between bursts."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _CountedBody:
+    """Stand-in for urllib3's raw stream so wire_bytes() works for non-urllib3 responses."""
+
+    def __init__(self, num_bytes: int) -> None:
+        self._num_bytes = num_bytes
+
+    def tell(self) -> int:
+        return self._num_bytes
+
+    def close(self) -> None:
+        pass
+
+
+class HTTP2Adapter(BaseAdapter):
+    """requests transport adapter that sends over a single multiplexed httpx HTTP/2 client.
+
+    There is no urllib3 pool to inspect, so connections are counted from httpx's
+    request trace events for connection_stats().
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        import httpx  # optional dependency: reddit-cli[http2]
+
+        self._client = httpx.Client(http2=True)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def _trace(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.requests_sent += 1
+        r = self._client.request(
+            request.method,
+            request.url,
+            headers=dict(request.headers),
+            content=request.body,
+            timeout=timeout,
+            extensions={"trace": self._trace},
+        )
+        return _response(
+            request, r.status_code, r.reason_phrase, r.headers, r.content, r.num_bytes_downloaded, r.encoding
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def _response(request, status, reason, headers, content, num_bytes, encoding=None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.reason = reason
+    resp.headers = CaseInsensitiveDict(headers)
+    resp._content = content
+    resp.encoding = encoding
+    resp.url = request.url
+    resp.request = request
+    resp.raw = _CountedBody(num_bytes)
+    return resp
+
+
+def _replay_key(method: str, url: str) -> str:
+    """METHOD plus URL with sorted query params, so param order never breaks a match."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit(parts._replace(query=query, fragment=''))}"
+
+
+# Bodies are stored decoded, so framing headers no longer describe them
+_UNRECORDED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+
+class _ExchangeLog:
+    """DIR/exchanges.ndjson, shared by every recording adapter on the session."""
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(os.path.join(directory, RECORDING_FILE), "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def append(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()  # keep what was captured if the run dies mid-way
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class RecordingAdapter(BaseAdapter):
+    """Wraps a live adapter and appends every exchange to the run's log (--record).
+
+    Request headers are never written (they carry the Authorization token), and the
+    access_token in token responses is replaced, so a recording is safe to share.
+    """
+
+    def __init__(self, inner: BaseAdapter, log: _ExchangeLog) -> None:
+        super().__init__()
+        self._inner = inner
+        self._log = log
+
+    def send(self, request, **kwargs):
+        resp = self._inner.send(request, **kwargs)
+        content = resp.content
+        if urlsplit(request.url).path.endswith("/access_token"):
+            try:
+                token = json.loads(content)
+                token["access_token"] = "recorded"
+                content = json.dumps(token).encode()
+            except ValueError:
+                pass
+        entry = {
+            "key": _replay_key(request.method, request.url),
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _UNRECORDED_HEADERS},
+            "wire_bytes": wire_bytes(resp),
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        self._log.append(entry)
+        return resp
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves responses from a --record directory; never touches the network (--replay).
+
+    Responses are matched by method and URL and handed out in recorded order, so a
+    URL fetched twice replays both answers. Rate-limit headers are dropped so
+    prawcore never sleeps between replayed requests.
+    """
+
+    def __init__(self, directory: str) -> None:
+        super().__init__()
+        self._responses: dict[str, deque] = defaultdict(deque)
+        with open(os.path.join(directory, RECORDING_FILE), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._responses[entry["key"]].append(entry)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        key = _replay_key(request.method, request.url)
+        with self._lock:
+            queue = self._responses.get(key)
+            entry = queue.popleft() if queue else None
+        if entry is None:
+            raise requests.ConnectionError(f"no recorded response for {key}", request=request)
+        if "body_b64" in entry:
+            content = base64.b64decode(entry["body_b64"])
+        else:
+            content = entry["body"].encode("utf-8")
+        headers = {k: v for k, v in entry["headers"].items() if not k.lower().startswith("x-ratelimit-")}
+        return _response(
+            request, entry["status"], entry["reason"], headers, content, entry.get("wire_bytes") or len(content)
+        )
+
+    def close(self) -> None:
+        pass
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def session() -> requests.Session:
+    """Return the run-wide Session, building it on first use.
+
+    The connection pool is sized to the run's concurrency so parallel workers don't
+    open and discard sockets.
+    """
+    global _session
+    if _session is None:
+        s = requests.Session()
+        if _replay_dir is not None:
+            replay = ReplayAdapter(_replay_dir)
+            s.mount("http://", replay)
+            s.mount("https://", replay)
+            _session = s
+            return s
+        # Two hosts per run: www.reddit.com (token) and oauth.reddit.com (API)
+        plain = _KeepAliveAdapter(pool_connections=2, pool_maxsize=_pool_size)
+        secure = HTTP2Adapter() if _http2 else _KeepAliveAdapter(pool_connections=2, pool_maxsize=_pool_size)
+        if _record_dir is not None:
+            log = _ExchangeLog(_record_dir)
+            plain = RecordingAdapter(plain, log)
+            secure = RecordingAdapter(secure, log)
+        s.mount("http://", plain)
+        s.mount("https://", secure)
+        _session = s
+    return _session
+
+
+def wire_bytes(response) -> int | None:
+    """Bytes read off the socket for response (before gzip decoding), if known."""
+    tell = getattr(response.raw, "tell", None)
+    return tell() if tell else None
+
+
+def connection_stats() -> dict:
+    """Connections opened vs requests sent across the shared session's pools."""
+    opened = sent = 0
+    if _session is not None:
+        for adapter in _session.adapters.values():
+            if isinstance(adapter, RecordingAdapter):
+                adapter = adapter._inner
+            if isinstance(adapter, HTTP2Adapter):
+                opened += adapter.connections_opened
+                sent += adapter.requests_sent
+                continue
+            manager = getattr(adapter, "poolmanager", None)
+            if manager is None:
+                continue
+            for key in manager.pools.keys():
+                pool = manager.pools[key]
+                opened += pool.num_connections
+                sent += pool.num_requests
+    return {"connections_opened": opened, "pooled_requests": sent}
@@ -0,0 +1,19 @@
+from reddit_cli.matching import Matcher
+
+
+def test_overlapping_keywords_and_regexes_are_all_reported():
+    m = Matcher(["new york", "york", "new", "python"], [r"py\w+"])
+    assert m.find("I love New York and python") == {"new york", "york", "new", "python", r"re:py\w+"}
+
+
+def test_keywords_match_whole_words_only():
+    m = Matcher(["go", "py"], [])
+    assert m.find("going to pypi") == set()
+    assert m.find("Go, py!") == {"go", "py"}
+
+
+def test_find_adds_to_earlier_hits_of_the_same_post():
+    m = Matcher(["rust"], [r"go\d", r"py\d"])
+    found = m.find("go1 in the title")
+    assert m.find("py3 and rust in the body", found) is found
+    assert found == {"rust", r"re:go\d", r"re:py\d"}